@@ -11,8 +11,9 @@ Implements:
 - POST /emulator/reset - Reset all state
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 
+from iap_emulator.api.dependencies import json_body, json_body_openapi
 from iap_emulator.logging_config import get_logger
 from iap_emulator.models import (
     AdvanceTimeRequest,
@@ -54,8 +55,11 @@ time_controller = get_time_controller()
     response_model=CreatePurchaseResponse,
     status_code=201,
     summary="Create test purchase",
+    openapi_extra=json_body_openapi(CreatePurchaseRequest),
 )
-async def create_purchase(request: CreatePurchaseRequest) -> CreatePurchaseResponse:
+async def create_purchase(
+    request: CreatePurchaseRequest = Depends(json_body(CreatePurchaseRequest)),
+) -> Response:
     """Create a test purchase for a one-time product.
 
     This endpoint allows you to simulate a purchase without going through
@@ -96,7 +100,7 @@ async def create_purchase(request: CreatePurchaseRequest) -> CreatePurchaseRespo
             order_id=purchase.order_id,
         )
 
-        response = CreatePurchaseResponse(
+        response = CreatePurchaseResponse.build(
             token=purchase.token,
             product_id=purchase.product_id,
             user_id=purchase.user_id,
@@ -107,7 +111,7 @@ async def create_purchase(request: CreatePurchaseRequest) -> CreatePurchaseRespo
             consumption_state=purchase.consumption_state.value,
             message="Purchase created successfully",
         )
-        return response
+        return response.to_json_response(status_code=201)
     except ProductNotFoundError:
         logger.warning(
             "product_not_found",
@@ -139,8 +143,11 @@ async def create_purchase(request: CreatePurchaseRequest) -> CreatePurchaseRespo
     response_model=CreateSubscriptionResponse,
     status_code=201,
     summary="Create test subscription",
+    openapi_extra=json_body_openapi(CreateSubscriptionRequest),
 )
-async def create_subscription(request: CreateSubscriptionRequest) -> CreateSubscriptionResponse:
+async def create_subscription(
+    request: CreateSubscriptionRequest = Depends(json_body(CreateSubscriptionRequest)),
+) -> Response:
     """Create a test subscription.
 
     This endpoint allows you to simulate a subscription purchase without going through
@@ -183,7 +190,7 @@ async def create_subscription(request: CreateSubscriptionRequest) -> CreateSubsc
             expiry_time=subscription.expiry_time_millis,
         )
 
-        response = CreateSubscriptionResponse(
+        response = CreateSubscriptionResponse.build(
             token=subscription.token,
             subscription_id=subscription.subscription_id,
             user_id=subscription.user_id,
@@ -193,7 +200,7 @@ async def create_subscription(request: CreateSubscriptionRequest) -> CreateSubsc
             in_trial=subscription.in_trial,
             message="Subscription created successfully",
         )
-        return response
+        return response.to_json_response(status_code=201)
     except ProductNotFoundError:
         logger.warning(
             "subscription_not_found",
@@ -259,8 +266,11 @@ async def list_subscriptions():
     "/time/advance",
     response_model=AdvanceTimeResponse,
     summary="Advance virtual time",
+    openapi_extra=json_body_openapi(AdvanceTimeRequest),
 )
-async def advance_time(request: AdvanceTimeRequest) -> AdvanceTimeResponse:
+async def advance_time(
+    request: AdvanceTimeRequest = Depends(json_body(AdvanceTimeRequest)),
+) -> Response:
     """Advance the emulator's virtual time forward.
 
     This triggers automatic processing of:
@@ -285,15 +295,16 @@ async def advance_time(request: AdvanceTimeRequest) -> AdvanceTimeResponse:
         minutes=request.minutes,
     )
 
-    try:
-        previous_time = time_controller.get_current_time_millis()
+    days = request.days or 0
+    hours = request.hours or 0
+    minutes = request.minutes or 0
 
-        time_controller.advance_time(
-            days=request.days or 0, hours=request.hours or 0, minutes=request.minutes or 0
-        )
+    try:
+        result = time_controller.advance_time(days=days, hours=hours, minutes=minutes)
 
-        current_time = time_controller.get_current_time_millis()
-        advanced_by = current_time - previous_time
+        previous_time = result["old_time_millis"]
+        current_time = result["new_time_millis"]
+        advanced_by = result["time_advanced_millis"]
 
         # TODO: get actual counts from time controller, now it's placeholder
         renewals_processed = 0
@@ -307,17 +318,17 @@ async def advance_time(request: AdvanceTimeRequest) -> AdvanceTimeResponse:
             advanced_by_millis=advanced_by,
         )
 
-        response = AdvanceTimeResponse(
+        response = AdvanceTimeResponse.build(
             previous_time_millis=previous_time,
             current_time_millis=current_time,
             advanced_by_millis=advanced_by,
             renewals_processed=renewals_processed,
             expirations_processed=expirations_processed,
             events_published=events_published,
-            message=f"Advanced time by {request.days or 0} days, {request.hours or 0} hours, {request.minutes or 0} minutes",
+            message=f"Advanced time by {days} days, {hours} hours, {minutes} minutes",
         )
 
-        return response
+        return response.to_json_response()
     except ValueError as e:
         logger.error(
             "invalid_time_request",
@@ -336,8 +347,11 @@ async def advance_time(request: AdvanceTimeRequest) -> AdvanceTimeResponse:
     "/time/set",
     response_model=SetTimeResponse,
     summary="Set virtual time to specific timestamp",
+    openapi_extra=json_body_openapi(SetTimeRequest),
 )
-async def set_time(request: SetTimeRequest) -> SetTimeResponse:
+async def set_time(
+    request: SetTimeRequest = Depends(json_body(SetTimeRequest)),
+) -> Response:
     """Set the emulator's virtual time to a specific timestamp.
 
     This allows you to jump to any point in time, forward or backward.
@@ -378,13 +392,13 @@ async def set_time(request: SetTimeRequest) -> SetTimeResponse:
 
         dt = datetime.fromtimestamp(request.time_millis / 1000.0)
 
-        response = SetTimeResponse(
+        response = SetTimeResponse.build(
             previous_time_millis=previous_time,
             current_time_millis=current_time,
             message=f"Time set to {dt.strftime('%Y-%m-%d %H:%M:%S')} UTC",
         )
 
-        return response
+        return response.to_json_response()
 
     except ValueError as e:
         logger.error(
@@ -405,7 +419,7 @@ async def set_time(request: SetTimeRequest) -> SetTimeResponse:
     response_model=ResetTimeResponse,
     summary="Reset virtual time to real current time",
 )
-async def reset_time() -> ResetTimeResponse:
+async def reset_time() -> Response:
     """Reset the emulator's virtual time back to real current time.
 
     This clears any time offset and returns the emulator to normal operation.
@@ -432,14 +446,14 @@ async def reset_time() -> ResetTimeResponse:
             current_time=current_time,
         )
 
-        response = ResetTimeResponse(
+        response = ResetTimeResponse.build(
             previous_time_millis=previous_time,
             current_time_millis=current_time,
             offset_cleared=True,
             message="Time reset to real current time",
         )
 
-        return response
+        return response.to_json_response()
 
     except Exception as e:
         logger.error(
@@ -460,7 +474,7 @@ async def reset_time() -> ResetTimeResponse:
     response_model=ResetResponse,
     summary="Reset emulator state",
 )
-async def reset_emulator() -> ResetResponse:
+async def reset_emulator() -> Response:
     """Reset all emulator state.
 
     This clears:
@@ -498,14 +512,14 @@ async def reset_emulator() -> ResetResponse:
             subscriptions_deleted=subscriptions_count,
         )
 
-        response = ResetResponse(
+        response = ResetResponse.build(
             subscriptions_deleted=subscriptions_count,
             purchases_deleted=purchases_count,
             time_reset=True,
             message="Emulator state reset successfully",
         )
 
-        return response
+        return response.to_json_response()
     except Exception as e:
         logger.error(
             "reset_emulator_failed",
@@ -525,7 +539,7 @@ async def reset_emulator() -> ResetResponse:
     response_model=StatusResponse,
     summary="Get emulator status",
 )
-async def get_status() -> StatusResponse:
+async def get_status() -> Response:
     """Get current emulator status and statistics.
 
     Returns information about:
@@ -561,7 +575,7 @@ async def get_status() -> StatusResponse:
         real_time = int(time.time() * 1000)
         time_offset = current_time - real_time
 
-        response = StatusResponse(
+        response = StatusResponse.build(
             status="running",
             current_time_millis=current_time,
             time_offset_millis=time_offset,
@@ -577,7 +591,7 @@ async def get_status() -> StatusResponse:
             },
         )
 
-        return response
+        return response.to_json_response()
 
     except Exception as e:
         logger.error(
@@ -598,7 +612,7 @@ async def get_status() -> StatusResponse:
     response_model=RenewSubscriptionResponse,
     summary="Manually renew subscription",
 )
-async def renew_subscription(token: str) -> RenewSubscriptionResponse:
+async def renew_subscription(token: str) -> Response:
     """Manually trigger subscription renewal.
 
     Forces an immediate renewal regardless of expiry time.
@@ -642,7 +656,7 @@ async def renew_subscription(token: str) -> RenewSubscriptionResponse:
             renewal_count=updated_subscription.renewal_count,
         )
 
-        response = RenewSubscriptionResponse(
+        response = RenewSubscriptionResponse.build(
             token=token,
             previous_expiry_millis=previous_expiry,
             new_expiry_millis=updated_subscription.expiry_time_millis,
@@ -650,7 +664,7 @@ async def renew_subscription(token: str) -> RenewSubscriptionResponse:
             message="Subscription renewed successfully",
         )
 
-        return response
+        return response.to_json_response()
 
     except SubscriptionNotFoundError:
         logger.warning(
@@ -683,11 +697,14 @@ async def renew_subscription(token: str) -> RenewSubscriptionResponse:
     "/subscriptions/{token}/cancel",
     response_model=CancelSubscriptionResponse,
     summary="Cancel subscription",
+    openapi_extra=json_body_openapi(CancelSubscriptionRequest, required=False),
 )
 async def cancel_subscription_control(
     token: str,
-    request: CancelSubscriptionRequest = CancelSubscriptionRequest(),
-) -> CancelSubscriptionResponse:
+    request: CancelSubscriptionRequest = Depends(
+        json_body(CancelSubscriptionRequest, default=CancelSubscriptionRequest())
+    ),
+) -> Response:
     """Cancel a subscription.
 
     Args:
@@ -735,7 +752,7 @@ async def cancel_subscription_control(
             expiry_time=subscription.expiry_time_millis,
         )
 
-        response = CancelSubscriptionResponse(
+        response = CancelSubscriptionResponse.build(
             token=token,
             canceled_time_millis=subscription.canceled_time_millis or 0,
             expiry_time_millis=subscription.expiry_time_millis,
@@ -743,7 +760,7 @@ async def cancel_subscription_control(
             message="Subscription canceled successfully",
         )
 
-        return response
+        return response.to_json_response()
 
     except SubscriptionNotFoundError:
         logger.warning(
@@ -764,7 +781,7 @@ async def cancel_subscription_control(
     response_model=PaymentFailedResponse,
     summary="Simulate payment failure",
 )
-async def simulate_payment_failure(token: str) -> PaymentFailedResponse:
+async def simulate_payment_failure(token: str) -> Response:
     """Simulate a payment failure for a subscription.
 
     Moves subscription into grace period. Useful for testing
@@ -806,7 +823,7 @@ async def simulate_payment_failure(token: str) -> PaymentFailedResponse:
             grace_period_end=subscription.grace_period_end_millis,
         )
 
-        response = PaymentFailedResponse(
+        response = PaymentFailedResponse.build(
             token=token,
             payment_failed_time_millis=current_time,
             grace_period_end_millis=subscription.grace_period_end_millis,
@@ -814,7 +831,7 @@ async def simulate_payment_failure(token: str) -> PaymentFailedResponse:
             message="Payment failure simulated, subscription in grace period",
         )
 
-        return response
+        return response.to_json_response()
 
     except SubscriptionNotFoundError:
         logger.warning(
@@ -848,7 +865,7 @@ async def simulate_payment_failure(token: str) -> PaymentFailedResponse:
     response_model=PaymentRecoveredResponse,
     summary="Recover from payment failure",
 )
-async def recover_payment(token: str) -> PaymentRecoveredResponse:
+async def recover_payment(token: str) -> Response:
     """Recover a subscription from payment failure.
 
     Moves subscription from grace period or account hold back to active.
@@ -889,7 +906,7 @@ async def recover_payment(token: str) -> PaymentRecoveredResponse:
             new_expiry=subscription.expiry_time_millis,
         )
 
-        response = PaymentRecoveredResponse(
+        response = PaymentRecoveredResponse.build(
             token=token,
             recovery_time_millis=current_time,
             new_state=subscription.state.value,
@@ -897,7 +914,7 @@ async def recover_payment(token: str) -> PaymentRecoveredResponse:
             message="Payment recovered, subscription reactivated",
         )
 
-        return response
+        return response.to_json_response()
 
     except SubscriptionNotFoundError:
         logger.warning(
@@ -930,11 +947,14 @@ async def recover_payment(token: str) -> PaymentRecoveredResponse:
     "/subscriptions/{token}/pause",
     response_model=PauseSubscriptionResponse,
     summary="Pause subscription",
+    openapi_extra=json_body_openapi(PauseSubscriptionRequest, required=False),
 )
 async def pause_subscription(
     token: str,
-    request: PauseSubscriptionRequest = PauseSubscriptionRequest(),
-) -> PauseSubscriptionResponse:
+    request: PauseSubscriptionRequest = Depends(
+        json_body(PauseSubscriptionRequest, default=PauseSubscriptionRequest())
+    ),
+) -> Response:
     """Pause a subscription.
 
     Args:
@@ -980,14 +1000,14 @@ async def pause_subscription(
             pause_end=subscription.pause_end_millis,
         )
 
-        response = PauseSubscriptionResponse(
+        response = PauseSubscriptionResponse.build(
             token=token,
             pause_start_millis=subscription.pause_start_millis or current_time,
             pause_end_millis=subscription.pause_end_millis,
             message="Subscription paused successfully",
         )
 
-        return response
+        return response.to_json_response()
 
     except SubscriptionNotFoundError:
         logger.warning(
@@ -1021,7 +1041,7 @@ async def pause_subscription(
     response_model=ResumeSubscriptionResponse,
     summary="Resume paused subscription",
 )
-async def resume_subscription(token: str) -> ResumeSubscriptionResponse:
+async def resume_subscription(token: str) -> Response:
     """Resume a paused subscription.
 
     Args:
@@ -1059,14 +1079,14 @@ async def resume_subscription(token: str) -> ResumeSubscriptionResponse:
             new_expiry=subscription.expiry_time_millis,
         )
 
-        response = ResumeSubscriptionResponse(
+        response = ResumeSubscriptionResponse.build(
             token=token,
             resume_time_millis=current_time,
             new_expiry_millis=subscription.expiry_time_millis,
             message="Subscription resumed successfully",
         )
 
-        return response
+        return response.to_json_response()
 
     except SubscriptionNotFoundError:
         logger.warning(
@@ -9,8 +9,9 @@ Implements:
 
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Path, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response
 
+from iap_emulator.api.dependencies import json_body, json_body_openapi
 from iap_emulator.logging_config import get_logger
 from iap_emulator.models import (
     PaymentState,
@@ -33,8 +34,8 @@ subscription_engine = SubscriptionEngine()
 
 
 def _convert_product_purchase(record: ProductPurchaseRecord) -> ProductPurchase:
-    return ProductPurchase(
-        purchaseTimeMillis=str(record.purchase_time_millis),
+    return ProductPurchase.build(
+        purchaseTimeMillis=record.purchase_time_millis,
         purchaseState=record.purchase_state.value,
         consumptionState=record.consumption_state.value,
         acknowledgementState=record.acknowledgement_state.value,
@@ -85,28 +86,18 @@ def _convert_subscription_purchase(record: SubscriptionRecord) -> SubscriptionPu
             # Fallback for string values
             cancel_reason_value = 0  # Default to USER_CANCELED
 
-    # User cancellation time (optional)
-    user_cancellation_time: Optional[str] = None
-    if record.canceled_time_millis is not None:
-        user_cancellation_time = str(record.canceled_time_millis)
-
-    # Auto-resume time for paused subscriptions (optional)
-    auto_resume_time: Optional[str] = None
-    if record.pause_end_millis is not None:
-        auto_resume_time = str(record.pause_end_millis)
-
-    return SubscriptionPurchase(
-        startTimeMillis=str(record.start_time_millis),
-        expiryTimeMillis=str(record.expiry_time_millis),
-        autoResumeTimeMillis=auto_resume_time,
+    return SubscriptionPurchase.build(
+        startTimeMillis=record.start_time_millis,
+        expiryTimeMillis=record.expiry_time_millis,
+        autoResumeTimeMillis=record.pause_end_millis,
         autoRenewing=auto_renewing,
         priceCurrencyCode=record.price_currency_code,
-        priceAmountMicros=str(record.price_amount_micros),
+        priceAmountMicros=record.price_amount_micros,
         countryCode="US",  # Default country code
         developerPayload=None,  # Subscriptions typically don't use developer payload
         paymentState=payment_state_value,
         cancelReason=cancel_reason_value,
-        userCancellationTimeMillis=user_cancellation_time,
+        userCancellationTimeMillis=record.canceled_time_millis,
         orderId=record.order_id,
         purchaseToken=record.token,
         acknowledgementState=record.acknowledgement_state,
@@ -119,7 +110,7 @@ def _convert_subscription_purchase(record: SubscriptionRecord) -> SubscriptionPu
 )
 async def get_product_purchase(
     packageName: str = Path(...), productId: str = Path(...), token: str = Path(...)
-) -> ProductPurchase:
+) -> Response:
     logger.info(
         "get_product_purchase_request",
         package_name=packageName,
@@ -186,7 +177,7 @@ async def get_product_purchase(
         product_id=productId,
         purchase_state=purchase.purchase_state.name,
     )
-    return response
+    return response.to_json_response()
 
 
 @router.get(
@@ -197,7 +188,7 @@ async def get_subscription_purchase(
     packageName: str = Path(...),
     subscriptionId: str = Path(...),
     token: str = Path(...),
-) -> SubscriptionPurchase:
+) -> Response:
     """Query subscription purchase details by token.
 
     Emulates: GET androidpublisher/v3/.../purchases/subscriptions/{subscriptionId}/tokens/{token}
@@ -270,7 +261,7 @@ async def get_subscription_purchase(
             expiry_time=subscription.expiry_time_millis,
         )
 
-        return response
+        return response.to_json_response()
     except SubscriptionNotFoundError:
         logger.warning(
             "subscription_not_found",
@@ -556,13 +547,14 @@ async def revoke_subscription(
     "/androidpublisher/v3/applications/{packageName}/purchases/subscriptions/{subscriptionId}/tokens/{token}:defer",
     response_model=SubscriptionPurchase,
     summary="Defer subscription renewal",
+    openapi_extra=json_body_openapi(DeferSubscriptionRequest),
 )
 async def defer_subscription(
     packageName: str = Path(..., description="Android package name"),
     subscriptionId: str = Path(..., description="Subscription product ID"),
     token: str = Path(..., description="Purchase token"),
-    request: DeferSubscriptionRequest = ...,
-) -> SubscriptionPurchase:
+    request: DeferSubscriptionRequest = Depends(json_body(DeferSubscriptionRequest)),
+) -> Response:
     """Defer subscription renewal by extending expiry time.
 
     Emulates: POST androidpublisher/v3/.../subscriptions/{subscriptionId}/tokens/{token}:defer
@@ -617,11 +609,11 @@ async def defer_subscription(
 
         # Extract new expiry time from request
         deferral_info = request.deferralInfo
-        new_expiry_str = deferral_info.get("expectedExpiryTimeMillis") or deferral_info.get(
+        new_expiry_millis = deferral_info.get("expectedExpiryTimeMillis") or deferral_info.get(
             "desiredExpiryTimeMillis"
         )
 
-        if not new_expiry_str:
+        if not new_expiry_millis:
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -633,20 +625,6 @@ async def defer_subscription(
                 },
             )
 
-        try:
-            new_expiry_millis = int(new_expiry_str)
-        except (ValueError, TypeError):
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "error": {
-                        "code": 400,
-                        "message": "Invalid expiry time format. Must be a numeric string.",
-                        "status": "INVALID_ARGUMENT",
-                    }
-                },
-            )
-
         # Defer the subscription
         try:
             updated_subscription = subscription_engine.defer_subscription(token, new_expiry_millis)
@@ -672,7 +650,7 @@ async def defer_subscription(
             token=token[:20] + "...",
         )
 
-        return response
+        return response.to_json_response()
 
     except SubscriptionNotFoundError:
         logger.warning(
@@ -34,6 +34,7 @@ class Config:
         """
         self._config_path = self._resolve_config_path(config_path)
         self._products_config: Optional[ProductsConfig] = None
+        self._raw_text: Optional[str] = None
         self._load_config()
 
     def _resolve_config_path(self, config_path: Optional[str]) -> Path:
@@ -58,14 +59,20 @@ class Config:
             )
 
         try:
-            with open(self._config_path, encoding="utf-8") as f:
-                raw_config = yaml.safe_load(f)
+            raw_text = self._config_path.read_text(encoding="utf-8")
+
+            # The file is unchanged since the last load, keep the validated config
+            if raw_text == self._raw_text and self._products_config is not None:
+                return
+
+            raw_config = yaml.safe_load(raw_text)
 
             if not raw_config:
                 raise ConfigurationError(f"Configuration file is empty: {self._config_path}")
 
             # Validate with Pydantic
             self._products_config = ProductsConfig(**raw_config)
+            self._raw_text = raw_text
 
         except yaml.YAMLError as e:
             raise ConfigurationError(f"Failed to parse YAML configuration: {e}")
@@ -152,7 +159,8 @@ class Config:
     def reload(self) -> None:
         """Reload configuration from disk.
 
-        Useful for development when products.yaml is modified.
+        Useful for development when products.yaml is modified. If the file
+        content has not changed, the already validated configuration is kept.
         """
         self._load_config()
 
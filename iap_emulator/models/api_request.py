@@ -2,7 +2,10 @@
 
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+from typing_extensions import TypedDict
+
+from .api_response import ResponseModel
 
 
 class CreatePurchaseRequest(BaseModel):
@@ -13,18 +16,19 @@ class CreatePurchaseRequest(BaseModel):
     package_name: Optional[str] = Field(None, description="Android package name")
     developer_payload: Optional[str] = Field(None, description="Optional developer-specified payload")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "product_id": "coins.100",
                 "user_id": "user-123",
                 "package_name": "com.example.app",
                 "developer_payload": "test-payload",
             }
-        }
+        },
+    )
 
 
-class CreatePurchaseResponse(BaseModel):
+class CreatePurchaseResponse(ResponseModel):
     """Response after creating a purchase"""
 
     token: str = Field(..., description="Generated purchase token")
@@ -37,8 +41,8 @@ class CreatePurchaseResponse(BaseModel):
     consumption_state: int = Field(..., description="Consumption state (0=not consumed)")
     message: str = Field(..., description="Success message")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "token": "emulator_purchase_abc123...",
                 "product_id": "coins.100",
@@ -50,7 +54,8 @@ class CreatePurchaseResponse(BaseModel):
                 "consumption_state": 0,
                 "message": "Purchase created successfully",
             }
-        }
+        },
+    )
 
 
 class CreateSubscriptionRequest(BaseModel):
@@ -61,18 +66,19 @@ class CreateSubscriptionRequest(BaseModel):
     package_name: Optional[str] = Field(None, description="Android package name (uses default if not provided)")
     start_trial: bool = Field(default=False, description="Whether to start in trial period")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "subscription_id": "premium.personal.yearly",
                 "user_id": "user-123",
                 "package_name": "com.example.secureapp",
                 "start_trial": False,
             }
-        }
+        },
+    )
 
 
-class CreateSubscriptionResponse(BaseModel):
+class CreateSubscriptionResponse(ResponseModel):
     """Response after creating a subscription."""
 
     token: str = Field(..., description="Generated purchase token")
@@ -84,8 +90,8 @@ class CreateSubscriptionResponse(BaseModel):
     in_trial: bool = Field(..., description="Whether in trial period")
     message: str = Field(..., description="Success message")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "token": "emulator_abc123...",
                 "subscription_id": "premium.personal.yearly",
@@ -96,7 +102,8 @@ class CreateSubscriptionResponse(BaseModel):
                 "in_trial": False,
                 "message": "Subscription created successfully",
             }
-        }
+        },
+    )
 
 
 class AdvanceTimeRequest(BaseModel):
@@ -106,17 +113,18 @@ class AdvanceTimeRequest(BaseModel):
     hours: Optional[int] = Field(None, description="Hours to advance")
     minutes: Optional[int] = Field(None, description="Minutes to advance")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "days": 365,
                 "hours": 0,
                 "minutes": 0,
             }
-        }
+        },
+    )
 
 
-class AdvanceTimeResponse(BaseModel):
+class AdvanceTimeResponse(ResponseModel):
     """Response after advancing time."""
 
     previous_time_millis: int = Field(..., description="Previous virtual time")
@@ -127,8 +135,8 @@ class AdvanceTimeResponse(BaseModel):
     events_published: int = Field(..., description="Number of RTDN events published")
     message: str = Field(..., description="Success message")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "previous_time_millis": 1700000000000,
                 "current_time_millis": 1731536000000,
@@ -138,7 +146,8 @@ class AdvanceTimeResponse(BaseModel):
                 "events_published": 7,
                 "message": "Advanced time by 365 days",
             }
-        }
+        },
+    )
 
 
 class CancelSubscriptionRequest(BaseModel):
@@ -149,16 +158,17 @@ class CancelSubscriptionRequest(BaseModel):
         default=False, description="If true, cancel immediately; if false, cancel at period end"
     )
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "cancel_reason": 0,
                 "immediate": False,
             }
-        }
+        },
+    )
 
 
-class CancelSubscriptionResponse(BaseModel):
+class CancelSubscriptionResponse(ResponseModel):
     """Response after canceling a subscription."""
 
     token: str = Field(..., description="Purchase token")
@@ -167,8 +177,8 @@ class CancelSubscriptionResponse(BaseModel):
     auto_renewing: bool = Field(..., description="Auto-renew status (should be false)")
     message: str = Field(..., description="Success message")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "token": "emulator_abc123...",
                 "canceled_time_millis": 1700000000000,
@@ -176,10 +186,11 @@ class CancelSubscriptionResponse(BaseModel):
                 "auto_renewing": False,
                 "message": "Subscription canceled successfully",
             }
-        }
+        },
+    )
 
 
-class RenewSubscriptionResponse(BaseModel):
+class RenewSubscriptionResponse(ResponseModel):
     """Response after renewing a subscription."""
 
     token: str = Field(..., description="Purchase token")
@@ -188,8 +199,8 @@ class RenewSubscriptionResponse(BaseModel):
     renewal_count: int = Field(..., description="Total renewal count")
     message: str = Field(..., description="Success message")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "token": "emulator_abc123...",
                 "previous_expiry_millis": 1731536000000,
@@ -197,7 +208,8 @@ class RenewSubscriptionResponse(BaseModel):
                 "renewal_count": 1,
                 "message": "Subscription renewed successfully",
             }
-        }
+        },
+    )
 
 
 class PauseSubscriptionRequest(BaseModel):
@@ -207,15 +219,16 @@ class PauseSubscriptionRequest(BaseModel):
         None, description="Duration to pause in days (if not specified, pauses indefinitely)"
     )
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "pause_duration_days": 90,
             }
-        }
+        },
+    )
 
 
-class PauseSubscriptionResponse(BaseModel):
+class PauseSubscriptionResponse(ResponseModel):
     """Response after pausing a subscription."""
 
     token: str = Field(..., description="Purchase token")
@@ -223,18 +236,21 @@ class PauseSubscriptionResponse(BaseModel):
     pause_end_millis: Optional[int] = Field(None, description="Pause end time (if duration specified)")
     message: str = Field(..., description="Success message")
 
-    class Config:
-        json_schema_extra = {
+    _exclude_none = True
+
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "token": "emulator_abc123...",
                 "pause_start_millis": 1700000000000,
                 "pause_end_millis": 1707776000000,
                 "message": "Subscription paused successfully",
             }
-        }
+        },
+    )
 
 
-class ResumeSubscriptionResponse(BaseModel):
+class ResumeSubscriptionResponse(ResponseModel):
     """Response after resuming a subscription."""
 
     token: str = Field(..., description="Purchase token")
@@ -242,18 +258,19 @@ class ResumeSubscriptionResponse(BaseModel):
     new_expiry_millis: int = Field(..., description="New expiry time")
     message: str = Field(..., description="Success message")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "token": "emulator_abc123...",
                 "resume_time_millis": 1700000000000,
                 "new_expiry_millis": 1731536000000,
                 "message": "Subscription resumed successfully",
             }
-        }
+        },
+    )
 
 
-class PaymentFailedResponse(BaseModel):
+class PaymentFailedResponse(ResponseModel):
     """Response after simulating payment failure."""
 
     token: str = Field(..., description="Purchase token")
@@ -262,8 +279,8 @@ class PaymentFailedResponse(BaseModel):
     new_state: int = Field(..., description="New subscription state")
     message: str = Field(..., description="Success message")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "token": "emulator_abc123...",
                 "payment_failed_time_millis": 1700000000000,
@@ -271,10 +288,11 @@ class PaymentFailedResponse(BaseModel):
                 "new_state": 2,  # IN_GRACE_PERIOD
                 "message": "Payment failure simulated, subscription in grace period",
             }
-        }
+        },
+    )
 
 
-class ResetResponse(BaseModel):
+class ResetResponse(ResponseModel):
     """Response after resetting emulator state."""
 
     subscriptions_deleted: int = Field(..., description="Number of subscriptions deleted")
@@ -282,30 +300,32 @@ class ResetResponse(BaseModel):
     time_reset: bool = Field(..., description="Whether time was reset")
     message: str = Field(..., description="Success message")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "subscriptions_deleted": 10,
                 "purchases_deleted": 5,
                 "time_reset": True,
                 "message": "Emulator state reset successfully",
             }
-        }
+        },
+    )
 
 
-class ErrorResponse(BaseModel):
+class ErrorResponse(ResponseModel):
     """Standard error response."""
 
     error: str = Field(..., description="Error message")
     details: Optional[str] = Field(None, description="Additional error details")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "error": "Subscription not found",
                 "details": "No subscription found with token: emulator_xyz...",
             }
-        }
+        },
+    )
 
 
 class SetTimeRequest(BaseModel):
@@ -313,32 +333,34 @@ class SetTimeRequest(BaseModel):
 
     time_millis: int = Field(..., description="Unix timestamp in milliseconds to set time to")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "time_millis": 1731536000000,
             }
-        }
+        },
+    )
 
 
-class SetTimeResponse(BaseModel):
+class SetTimeResponse(ResponseModel):
     """Response after setting time."""
 
     previous_time_millis: int = Field(..., description="Previous virtual time")
     current_time_millis: int = Field(..., description="New virtual time (as set)")
     message: str = Field(..., description="Success message")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "previous_time_millis": 1700000000000,
                 "current_time_millis": 1731536000000,
                 "message": "Time set to 2024-11-14 00:00:00 UTC",
             }
-        }
+        },
+    )
 
 
-class ResetTimeResponse(BaseModel):
+class ResetTimeResponse(ResponseModel):
     """Response after resetting time to real time."""
 
     previous_time_millis: int = Field(..., description="Previous virtual time")
@@ -346,27 +368,28 @@ class ResetTimeResponse(BaseModel):
     offset_cleared: bool = Field(..., description="Whether time offset was cleared")
     message: str = Field(..., description="Success message")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "previous_time_millis": 1731536000000,
                 "current_time_millis": 1700000000000,
                 "offset_cleared": True,
                 "message": "Time reset to real current time",
             }
-        }
+        },
+    )
 
 
-class StatusResponse(BaseModel):
+class StatusResponse(ResponseModel):
     """Emulator status response."""
 
     status: str = Field(..., description="Emulator status (running, idle)")
     current_time_millis: int = Field(..., description="Current virtual time")
     time_offset_millis: int = Field(..., description="Time offset from real time (0 if not set)")
-    statistics: dict = Field(..., description="Statistics about stored data")
+    statistics: dict[str, int] = Field(..., description="Statistics about stored data")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "status": "running",
                 "current_time_millis": 1700000000000,
@@ -378,7 +401,19 @@ class StatusResponse(BaseModel):
                     "total_products": 6,
                 },
             }
-        }
+        },
+    )
+
+
+class DeferralInfo(TypedDict, total=False):
+    """Deferral details for a subscription (Google Play API format).
+
+    The API sends millis as numeric strings; they are parsed to int during
+    request validation.
+    """
+
+    expectedExpiryTimeMillis: int
+    desiredExpiryTimeMillis: int
 
 
 class DeferSubscriptionRequest(BaseModel):
@@ -388,23 +423,24 @@ class DeferSubscriptionRequest(BaseModel):
     expiration time to the specified timestamp.
     """
 
-    deferralInfo: dict = Field(
+    deferralInfo: DeferralInfo = Field(
         ...,
         description="Deferral information containing expectedExpiryTimeMillis",
     )
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "deferralInfo": {
                     "expectedExpiryTimeMillis": "1763072000000",
                     "desiredExpiryTimeMillis": "1763072000000",
                 }
             }
-        }
+        },
+    )
 
 
-class PaymentRecoveredResponse(BaseModel):
+class PaymentRecoveredResponse(ResponseModel):
     """Response after recovering from payment failure."""
 
     token: str = Field(..., description="Purchase token")
@@ -413,8 +449,8 @@ class PaymentRecoveredResponse(BaseModel):
     new_expiry_millis: int = Field(..., description="New expiry time after recovery")
     message: str = Field(..., description="Success message")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "token": "emulator_abc123...",
                 "recovery_time_millis": 1700000000000,
@@ -422,4 +458,5 @@ class PaymentRecoveredResponse(BaseModel):
                 "new_expiry_millis": 1731536000000,
                 "message": "Payment recovered, subscription reactivated",
             }
-        }
+        },
+    )
@@ -3,19 +3,101 @@
 ProductPurchase and SubscriptionPurchase response formats.
 """
 
-from typing import Optional
+from typing import Annotated, Any, ClassVar, Dict, Optional, TypeVar
 
-from pydantic import BaseModel, Field
+from fastapi import Response
+from pydantic import BaseModel, ConfigDict, Field, GetPydanticSchema
+from pydantic_core import core_schema
 
+_object_setattr = object.__setattr__
 
-class ProductPurchase(BaseModel):
+# Google APIs encode int64 values (millis, micros) as JSON strings. Fields of
+# this type hold the int and pydantic-core stringifies it when writing JSON.
+Int64Str = Annotated[
+    int,
+    GetPydanticSchema(
+        lambda _source, _handler: core_schema.int_schema(
+            serialization=core_schema.to_string_ser_schema(when_used="json")
+        )
+    ),
+]
+
+_R = TypeVar("_R", bound="ResponseModel")
+
+
+class ResponseModel(BaseModel):
+    """Base class for models built by the emulator and returned to clients.
+
+    Responses are built once, serialized once and discarded, so they are
+    frozen and reject unknown fields.
+    """
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    # Field defaults in declaration order, with a placeholder for required
+    # fields. Response models only use immutable defaults, so one dict per
+    # class can be shared by every instance built from it.
+    _build_defaults: ClassVar[Dict[str, Any]] = {}
+
+    # Omit unset optional fields from JSON responses, as Google's API does.
+    _exclude_none: ClassVar[bool] = False
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        cls._build_defaults = {name: field.get_default() for name, field in cls.model_fields.items()}
+
+    @classmethod
+    def build(cls: type[_R], **fields: Any) -> _R:
+        """Build a response from trusted internal state without validation.
+
+        Response fields are populated from the emulator's own stores, which are
+        already validated, so this skips validation and type coercion. Inbound
+        request bodies must still go through normal validation.
+
+        Args:
+            **fields: Field values for the response
+
+        Returns:
+            Response model instance with only the provided fields marked as set
+        """
+        # Equivalent to model_construct(), without its per-field loop. Merging
+        # into the ordered defaults keeps serialized key order identical to a
+        # validated instance.
+        response = cls.__new__(cls)
+        _object_setattr(response, "__dict__", {**cls._build_defaults, **fields})
+        _object_setattr(response, "__pydantic_fields_set__", set(fields))
+        _object_setattr(response, "__pydantic_extra__", None)
+        _object_setattr(response, "__pydantic_private__", None)
+        return response
+
+    def to_json_response(self, status_code: int = 200) -> Response:
+        """Serialize to a JSON response using the pydantic-core serializer.
+
+        Returning a ready-made Response skips FastAPI's jsonable_encoder pass and
+        the re-validation against response_model.
+
+        Args:
+            status_code: HTTP status code for the response
+
+        Returns:
+            Response with the JSON-encoded model as body
+        """
+        return Response(
+            content=self.__pydantic_serializer__.to_json(self, exclude_none=self._exclude_none),
+            status_code=status_code,
+            media_type="application/json",
+        )
+
+
+class ProductPurchase(ResponseModel):
     """Response for GET /androidpublisher/v3/.../products/{productId}/tokens/{token}
 
     Matches Google Play Android Publisher API v3 ProductPurchase schema.
     """
 
     kind: str = Field(default="androidpublisher#productPurchase", description="Resource type")
-    purchaseTimeMillis: str = Field(..., description="Purchase time (Unix millis as string)")
+    purchaseTimeMillis: Int64Str = Field(..., description="Purchase time (Unix millis as string)")
     purchaseState: int = Field(..., description="Purchase state (0=purchased, 1=canceled, 2=pending)")
     consumptionState: int = Field(..., description="Consumption state (0=not consumed, 1=consumed)")
     developerPayload: Optional[str] = Field(None, description="Developer-specified payload")
@@ -28,8 +110,10 @@ class ProductPurchase(BaseModel):
     obfuscatedExternalProfileId: Optional[str] = Field(None, description="Obfuscated profile ID")
     regionCode: str = Field(default="US", description="Region code")
 
-    class Config:
-        json_schema_extra = {
+    _exclude_none = True
+
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "kind": "androidpublisher#productPurchase",
                 "purchaseTimeMillis": "1700000000000",
@@ -42,27 +126,28 @@ class ProductPurchase(BaseModel):
                 "quantity": 1,
                 "regionCode": "US",
             }
-        }
+        },
+    )
 
 
-class SubscriptionPurchase(BaseModel):
+class SubscriptionPurchase(ResponseModel):
     """Response for GET /androidpublisher/v3/.../subscriptions/{subscriptionId}/tokens/{token}
 
     Matches Google Play Android Publisher API v3 SubscriptionPurchase schema.
     """
 
     kind: str = Field(default="androidpublisher#subscriptionPurchase", description="Resource type")
-    startTimeMillis: str = Field(..., description="Subscription start time (Unix millis as string)")
-    expiryTimeMillis: str = Field(..., description="Subscription expiry time (Unix millis as string)")
-    autoResumeTimeMillis: Optional[str] = Field(None, description="Auto-resume time for paused subscriptions")
+    startTimeMillis: Int64Str = Field(..., description="Subscription start time (Unix millis as string)")
+    expiryTimeMillis: Int64Str = Field(..., description="Subscription expiry time (Unix millis as string)")
+    autoResumeTimeMillis: Optional[Int64Str] = Field(None, description="Auto-resume time for paused subscriptions")
     autoRenewing: bool = Field(..., description="Whether subscription will auto-renew")
     priceCurrencyCode: str = Field(..., description="ISO 4217 currency code")
-    priceAmountMicros: str = Field(..., description="Price in micros (as string)")
+    priceAmountMicros: Int64Str = Field(..., description="Price in micros (as string)")
     countryCode: str = Field(default="US", description="ISO 3166-1 alpha-2 country code")
     developerPayload: Optional[str] = Field(None, description="Developer-specified payload")
     paymentState: Optional[int] = Field(None, description="Payment state (0=pending, 1=received, 2=trial, 3=failed)")
     cancelReason: Optional[int] = Field(None, description="Cancel reason (0=user, 1=system, 2=replaced, 3=developer)")
-    userCancellationTimeMillis: Optional[str] = Field(None, description="User cancellation time")
+    userCancellationTimeMillis: Optional[Int64Str] = Field(None, description="User cancellation time")
     orderId: str = Field(..., description="Unique order ID")
     linkedPurchaseToken: Optional[str] = Field(None, description="Token of related purchase")
     purchaseType: Optional[int] = Field(None, description="Purchase type (0=test, 1=promo, 2=rewarded)")
@@ -76,8 +161,10 @@ class SubscriptionPurchase(BaseModel):
     profileId: Optional[str] = Field(None, description="Profile ID")
     purchaseToken: str = Field(..., description="Purchase token")
 
-    class Config:
-        json_schema_extra = {
+    _exclude_none = True
+
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "kind": "androidpublisher#subscriptionPurchase",
                 "startTimeMillis": "1700000000000",
@@ -91,10 +178,11 @@ class SubscriptionPurchase(BaseModel):
                 "acknowledgementState": 0,
                 "purchaseToken": "emulator_abc123...",
             }
-        }
+        },
+    )
 
 
-class SubscriptionPurchaseV2(BaseModel):
+class SubscriptionPurchaseV2(ResponseModel):
     """Response for Android Publisher API v2 subscription format (extended).
 
     Includes additional fields for subscription states, grace period, account hold, etc.
@@ -110,8 +198,10 @@ class SubscriptionPurchaseV2(BaseModel):
     canceledStateContext: Optional[dict] = Field(None, description="Cancellation context")
     pausedStateContext: Optional[dict] = Field(None, description="Pause context")
 
-    class Config:
-        json_schema_extra = {
+    _exclude_none = True
+
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "kind": "androidpublisher#subscriptionPurchaseV2",
                 "startTime": "2023-11-14T12:00:00.000Z",
@@ -120,4 +210,5 @@ class SubscriptionPurchaseV2(BaseModel):
                 "latestOrderId": "GPA.1234-5678-9012-34567",
                 "acknowledgementState": 0,
             }
-        }
+        },
+    )
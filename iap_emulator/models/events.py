@@ -5,65 +5,71 @@ Maps to Google Play Real-time Developer Notifications schema.
 
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
-from .subscription import NotificationType
 
+class _VersionedBase(BaseModel):
+    """Base for RTDN payloads, which all carry the same schema version.
 
-class SubscriptionNotification(BaseModel):
-    """Subscription notification payload within DeveloperNotification."""
+    Schema building is deferred until a notification is first validated, so
+    importing the models stays cheap for processes that never publish events.
+    """
 
     version: str = Field(default="1.0", description="Notification version")
+
+    model_config = ConfigDict(defer_build=True)
+
+
+class SubscriptionNotification(_VersionedBase):
+    """Subscription notification payload within DeveloperNotification."""
+
     notification_type: int = Field(..., description="Type of notification (1-13)")
     purchase_token: str = Field(..., description="Purchase token for the subscription")
     subscription_id: str = Field(..., description="Subscription product ID")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "version": "1.0",
-                "notification_type": NotificationType.SUBSCRIPTION_RENEWED,
+                "notification_type": 2,  # SUBSCRIPTION_RENEWED
                 "purchase_token": "emulator_abc123...",
                 "subscription_id": "premium.personal.yearly",
             }
-        }
+        },
+    )
 
 
-class OneTimeProductNotification(BaseModel):
+class OneTimeProductNotification(_VersionedBase):
     """One-time product notification payload within DeveloperNotification."""
 
-    version: str = Field(default="1.0", description="Notification version")
     notification_type: int = Field(..., description="Type of notification (1-4)")
     purchase_token: str = Field(..., description="Purchase token for the product")
     sku: str = Field(..., description="Product SKU/ID")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "version": "1.0",
                 "notification_type": 1,  # ONE_TIME_PRODUCT_PURCHASED
                 "purchase_token": "emulator_product_xyz789...",
                 "sku": "com.example.premium_unlock",
             }
-        }
+        },
+    )
 
 
-class TestNotification(BaseModel):
+class TestNotification(_VersionedBase):
     """Test notification for Pub/Sub configuration validation."""
 
-    version: str = Field(default="1.0", description="Notification version")
+    model_config = ConfigDict(json_schema_extra={"example": {"version": "1.0"}})
 
-    class Config:
-        json_schema_extra = {"example": {"version": "1.0"}}
 
-
-class DeveloperNotification(BaseModel):
+class DeveloperNotification(_VersionedBase):
     """Root RTDN message published to Pub/Sub.
 
     This matches the exact Google Play RTDN schema.
     """
 
-    version: str = Field(default="1.0", description="Notification version")
     package_name: str = Field(..., description="Android package name")
 
     # Event timestamp
@@ -78,17 +84,18 @@ class DeveloperNotification(BaseModel):
     )
     test_notification: Optional[TestNotification] = Field(None, description="Test notification data")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "version": "1.0",
                 "package_name": "com.example.secureapp",
                 "event_time_millis": 1700000000000,
                 "subscription_notification": {
                     "version": "1.0",
-                    "notification_type": NotificationType.SUBSCRIPTION_RENEWED,
+                    "notification_type": 2,  # SUBSCRIPTION_RENEWED
                     "purchase_token": "emulator_abc123...",
                     "subscription_id": "premium.personal.yearly",
                 },
             }
-        }
+        },
+    )
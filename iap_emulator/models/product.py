@@ -5,7 +5,7 @@ Models from products.yaml configuration.
 
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ProductDefinition(BaseModel):
@@ -31,8 +31,11 @@ class ProductDefinition(BaseModel):
     features: list[str] = Field(default_factory=list, description="List of features")
     max_users: Optional[int] = Field(None, description="Maximum users (for family plans)")
 
-    class Config:
-        json_schema_extra = {
+    # Definitions are loaded once and shared for the lifetime of the process,
+    # so they are immutable after validation.
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "id": "premium.personal.yearly",
                 "type": "subs",
@@ -47,7 +50,8 @@ class ProductDefinition(BaseModel):
                 "offer_id": None,
                 "features": ["Unlimited passwords", "Secure vault"],
             }
-        }
+        },
+    )
 
 
 class PubSubConfig(BaseModel):
@@ -57,6 +61,8 @@ class PubSubConfig(BaseModel):
     topic: str = Field(..., description="Pub/Sub topic name")
     default_subscription: str = Field(..., description="Default subscription name")
 
+    model_config = ConfigDict(frozen=True)
+
 
 class SubscriptionBehaviorConfig(BaseModel):
     """Subscription behavior configuration for the emulator."""
@@ -78,15 +84,17 @@ class SubscriptionBehaviorConfig(BaseModel):
         description="Proration mode for subscription changes"
     )
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "grace_period_behavior": "retain_access",
                 "account_hold_behavior": "revoke_access",
                 "allow_changes": True,
                 "proration_mode": "immediate_with_time_proration",
             }
-        }
+        },
+    )
 
 
 class EmulatorConfig(BaseModel):
@@ -103,6 +111,8 @@ class EmulatorConfig(BaseModel):
         description="Subscription behavior settings"
     )
 
+    model_config = ConfigDict(frozen=True)
+
 
 class ProductsConfig(BaseModel):
     """Complete products.yaml configuration."""
@@ -6,7 +6,9 @@ Represents active purchases and their state.
 from enum import IntEnum
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from iap_emulator.state_logger import log_consumption_change, log_purchase_state_change
 
 
 class PurchaseState(IntEnum):
@@ -31,6 +33,11 @@ class AcknowledgementState(IntEnum):
     ACKNOWLEDGED = 1  # Acknowledged
 
 
+# State names for transition logging, looked up without the Enum.name descriptor
+_PURCHASE_STATE_NAMES = {state: state.name for state in PurchaseState}
+_CONSUMPTION_STATE_NAMES = {state: state.name for state in ConsumptionState}
+
+
 class ProductPurchaseRecord(BaseModel):
     """Internal record for one-time product purchase."""
 
@@ -66,16 +73,14 @@ class ProductPurchaseRecord(BaseModel):
             new_state: New purchase state
             reason: Reason for state change
         """
-        from iap_emulator.state_logger import log_purchase_state_change
-
         old_state = self.purchase_state
         if old_state != new_state:
             self.purchase_state = new_state
             log_purchase_state_change(
                 token=self.token,
                 product_id=self.product_id,
-                old_state=old_state.name,
-                new_state=new_state.name,
+                old_state=_PURCHASE_STATE_NAMES[old_state],
+                new_state=_PURCHASE_STATE_NAMES[new_state],
                 reason=reason,
                 user_id=self.user_id,
             )
@@ -86,16 +91,14 @@ class ProductPurchaseRecord(BaseModel):
         Args:
             new_state: New consumption state
         """
-        from iap_emulator.state_logger import log_consumption_change
-
         old_state = self.consumption_state
         if old_state != new_state:
             self.consumption_state = new_state
             log_consumption_change(
                 token=self.token,
                 product_id=self.product_id,
-                old_state=old_state.name,
-                new_state=new_state.name,
+                old_state=_CONSUMPTION_STATE_NAMES[old_state],
+                new_state=_CONSUMPTION_STATE_NAMES[new_state],
                 user_id=self.user_id,
             )
 
@@ -109,8 +112,8 @@ class ProductPurchaseRecord(BaseModel):
         if old_state != AcknowledgementState.ACKNOWLEDGED:
             self.acknowledgement_state = AcknowledgementState.ACKNOWLEDGED
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "token": "emulator_product_xyz789...",
                 "product_id": "com.example.premium_unlock",
@@ -124,4 +127,5 @@ class ProductPurchaseRecord(BaseModel):
                 "price_amount_micros": 4990000,
                 "price_currency_code": "USD",
             }
-        }
+        },
+    )
@@ -3,10 +3,44 @@
 Includes subscription states, renewal tracking, billing periods.
 """
 
+from contextlib import contextmanager
+from contextvars import ContextVar
 from enum import IntEnum
-from typing import Optional
-
-from pydantic import BaseModel, Field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from iap_emulator.state_logger import (
+    log_auto_renew_change,
+    log_expiry_change,
+    log_payment_state_change,
+    log_subscription_state_change,
+    log_subscription_transition,
+)
+
+# Record that opened the active SubscriptionRecord.transaction(), and its change buffer
+_pending_changes: ContextVar[
+    Optional[Tuple["SubscriptionRecord", List[Dict[str, Any]]]]
+] = ContextVar("subscription_pending_changes", default=None)
+
+
+def _buffer_change(
+    record: "SubscriptionRecord", field: str, old: Any, new: Any, reason: Optional[str]
+) -> bool:
+    """Add a change to the active transaction buffer if it belongs to that transaction.
+
+    Returns:
+        True if the change was buffered, False if no transaction is active for
+        this record
+    """
+    pending = _pending_changes.get()
+    if pending is None or pending[0] is not record:
+        return False
+    changes = pending[1]
+    changes.append(
+        {"seq": len(changes), "field": field, "old": old, "new": new, "reason": reason}
+    )
+    return True
 
 
 class SubscriptionState(IntEnum):
@@ -56,6 +90,11 @@ class CancelReason(IntEnum):
     DEVELOPER_CANCELED = 3  # Developer canceled
 
 
+# State names for transition logging, looked up without the Enum.name descriptor
+_SUBSCRIPTION_STATE_NAMES = {state: state.name for state in SubscriptionState}
+_PAYMENT_STATE_NAMES = {state: state.name for state in PaymentState}
+
+
 class SubscriptionRecord(BaseModel):
     """Internal subscription record tracking state and lifecycle."""
 
@@ -108,16 +147,18 @@ class SubscriptionRecord(BaseModel):
             new_state: New state to transition to
             reason: Reason for state change
         """
-        from iap_emulator.state_logger import log_subscription_state_change
-
         old_state = self.state
         if old_state != new_state:
             self.state = new_state
+            old_name = _SUBSCRIPTION_STATE_NAMES[old_state]
+            new_name = _SUBSCRIPTION_STATE_NAMES[new_state]
+            if _buffer_change(self, "state", old_name, new_name, reason):
+                return
             log_subscription_state_change(
                 token=self.token,
                 subscription_id=self.subscription_id,
-                old_state=old_state.name,
-                new_state=new_state.name,
+                old_state=old_name,
+                new_state=new_name,
                 reason=reason,
                 user_id=self.user_id,
             )
@@ -129,16 +170,18 @@ class SubscriptionRecord(BaseModel):
             new_payment_state: New payment state
             reason: Reason for change
         """
-        from iap_emulator.state_logger import log_payment_state_change
-
         old_state = self.payment_state
         if old_state != new_payment_state:
             self.payment_state = new_payment_state
+            old_name = _PAYMENT_STATE_NAMES[old_state]
+            new_name = _PAYMENT_STATE_NAMES[new_payment_state]
+            if _buffer_change(self, "payment_state", old_name, new_name, reason):
+                return
             log_payment_state_change(
                 token=self.token,
                 subscription_id=self.subscription_id,
-                old_payment_state=old_state.name,
-                new_payment_state=new_payment_state.name,
+                old_payment_state=old_name,
+                new_payment_state=new_name,
                 reason=reason,
                 user_id=self.user_id,
             )
@@ -150,11 +193,11 @@ class SubscriptionRecord(BaseModel):
             auto_renewing: New auto-renewing value
             reason: Reason for change
         """
-        from iap_emulator.state_logger import log_auto_renew_change
-
         old_value = self.auto_renewing
         if old_value != auto_renewing:
             self.auto_renewing = auto_renewing
+            if _buffer_change(self, "auto_renewing", old_value, auto_renewing, reason):
+                return
             log_auto_renew_change(
                 token=self.token,
                 subscription_id=self.subscription_id,
@@ -171,10 +214,10 @@ class SubscriptionRecord(BaseModel):
             new_expiry_millis: New expiry time in milliseconds
             reason: Reason for extension (renewal, grace period, etc.)
         """
-        from iap_emulator.state_logger import log_expiry_change
-
         old_expiry = self.expiry_time_millis
         self.expiry_time_millis = new_expiry_millis
+        if _buffer_change(self, "expiry_time_millis", old_expiry, new_expiry_millis, reason):
+            return
         log_expiry_change(
             token=self.token,
             subscription_id=self.subscription_id,
@@ -185,6 +228,38 @@ class SubscriptionRecord(BaseModel):
             renewal_count=self.renewal_count,
         )
 
+    @contextmanager
+    def transaction(self, reason: Optional[str] = None) -> Iterator["SubscriptionRecord"]:
+        """Group state changes into a single log entry.
+
+        Changes made through set_state, set_payment_state, set_auto_renewing and
+        extend_expiry on this record inside the block are buffered and logged
+        together as one subscription_transition entry when the block exits.
+        Changes to other records are logged as usual. Each change keeps a
+        sequence number so the original order is preserved.
+
+        Args:
+            reason: Reason for the transition as a whole
+
+        Yields:
+            This subscription record
+        """
+        changes: List[Dict[str, Any]] = []
+        reset_token = _pending_changes.set((self, changes))
+        try:
+            yield self
+        finally:
+            _pending_changes.reset(reset_token)
+            if changes:
+                log_subscription_transition(
+                    token=self.token,
+                    subscription_id=self.subscription_id,
+                    changes=changes,
+                    reason=reason,
+                    user_id=self.user_id,
+                    renewal_count=self.renewal_count,
+                )
+
     def acknowledge(self) -> None:
         """Mark subscription as acknowledged.
 
@@ -193,8 +268,8 @@ class SubscriptionRecord(BaseModel):
         if self.acknowledgement_state != 1:
             self.acknowledgement_state = 1
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "token": "emulator_abc123...",
                 "subscription_id": "premium.personal.yearly",
@@ -212,4 +287,5 @@ class SubscriptionRecord(BaseModel):
                 "price_amount_micros": 29990000,
                 "price_currency_code": "USD",
             }
-        }
+        },
+    )
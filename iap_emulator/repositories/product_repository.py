@@ -3,16 +3,29 @@
 Loads from config/products.yaml and provides lookup methods.
 """
 
-from typing import Dict, List, Optional
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from iap_emulator.config import Config, get_config
 from iap_emulator.models import ProductDefinition
 
 
 class ProductNotFoundError(Exception):
-    """Raised when a product is not found in the repository."""
+    """Raised when a product is not found in the repository.
 
-    pass
+    The list of available products is only formatted when the error is
+    rendered, since most callers turn it into a 404 without reading it.
+    """
+
+    def __init__(self, message: str, available_ids: Sequence[str] = ()):
+        super().__init__(message)
+        self.available_ids = available_ids
+
+    def __str__(self) -> str:
+        message = super().__str__()
+        if self.available_ids:
+            return f"{message}. Available products: {list(self.available_ids)}"
+        return message
 
 
 class ProductRepository:
@@ -30,6 +43,10 @@ class ProductRepository:
         """
         self._config = config or get_config()
         self._products_by_id: Dict[str, ProductDefinition] = {}
+        self._products_by_type: Dict[str, List[ProductDefinition]] = {}
+        self._products_by_base_plan: Dict[str, List[ProductDefinition]] = {}
+        self._all_products: Tuple[ProductDefinition, ...] = ()
+        self._all_ids: Tuple[str, ...] = ()
         self._load_products()
 
     def _load_products(self) -> None:
@@ -44,6 +61,21 @@ class ProductRepository:
         for product in self._config.products.subscriptions:
             self._products_by_id[product.id] = product
 
+        # Secondary indexes for the type and base plan filters
+        self._products_by_type.clear()
+        self._products_by_base_plan.clear()
+        for product in self._products_by_id.values():
+            self._products_by_type.setdefault(product.type, []).append(product)
+            # Products without a base plan cannot be looked up by one
+            if product.base_plan_id is not None:
+                self._products_by_base_plan.setdefault(product.base_plan_id, []).append(
+                    product
+                )
+
+        # The catalog only changes on reload, so listings are shared read-only tuples
+        self._all_products = tuple(self._products_by_id.values())
+        self._all_ids = tuple(self._products_by_id.keys())
+
     def get_by_id(self, product_id: str) -> ProductDefinition:
         """Get product definition by ID.
 
@@ -56,13 +88,10 @@ class ProductRepository:
         Raises:
             ProductNotFoundError: If product ID not found
         """
-        product = self._products_by_id.get(product_id)
-        if product is None:
-            raise ProductNotFoundError(
-                f"Product not found: {product_id}. "
-                f"Available products: {list(self._products_by_id.keys())}"
-            )
-        return product
+        try:
+            return self._products_by_id[product_id]
+        except KeyError:
+            raise ProductNotFoundError(f"Product not found: {product_id}", self._all_ids) from None
 
     def find_by_id(self, product_id: str) -> Optional[ProductDefinition]:
         """Find product definition by ID (returns None if not found).
@@ -75,21 +104,21 @@ class ProductRepository:
         """
         return self._products_by_id.get(product_id)
 
-    def get_all_subscriptions(self) -> List[ProductDefinition]:
+    def get_all_subscriptions(self) -> Tuple[ProductDefinition, ...]:
         """Get all subscription definitions.
 
         Returns:
-            List of all ProductDefinition objects
+            Tuple of all ProductDefinition objects
         """
-        return list(self._products_by_id.values())
+        return self._all_products
 
-    def get_all_subscription_ids(self) -> List[str]:
-        """Get list of all subscription IDs.
+    def get_all_subscription_ids(self) -> Tuple[str, ...]:
+        """Get all subscription IDs.
 
         Returns:
-            List of subscription IDs
+            Tuple of subscription IDs
         """
-        return list(self._products_by_id.keys())
+        return self._all_ids
 
     def exists(self, product_id: str) -> bool:
         """Check if product ID exists.
@@ -119,7 +148,7 @@ class ProductRepository:
         Returns:
             List of matching ProductDefinition objects
         """
-        return [p for p in self._products_by_id.values() if p.type == product_type]
+        return list(self._products_by_type.get(product_type, ()))
 
     def get_subscriptions_by_base_plan(self, base_plan_id: str) -> List[ProductDefinition]:
         """Get subscriptions with a specific base plan ID.
@@ -130,7 +159,7 @@ class ProductRepository:
         Returns:
             List of matching ProductDefinition objects
         """
-        return [p for p in self._products_by_id.values() if p.base_plan_id == base_plan_id]
+        return list(self._products_by_base_plan.get(base_plan_id, ()))
 
     def reload(self) -> None:
         """Reload product definitions from configuration.
@@ -153,8 +182,11 @@ class ProductRepository:
         return f"ProductRepository(products={len(self._products_by_id)})"
 
 
-# Global repository instance
+# Global repository instance. A lock is used rather than functools.cache, which
+# can run the factory twice under concurrent first calls, and reload updates
+# the instance in place so services holding a reference see the new catalog.
 _repository_instance: Optional[ProductRepository] = None
+_repository_lock = threading.Lock()
 
 
 def get_product_repository(config: Optional[Config] = None) -> ProductRepository:
@@ -168,14 +200,17 @@ def get_product_repository(config: Optional[Config] = None) -> ProductRepository
     """
     global _repository_instance
     if _repository_instance is None:
-        _repository_instance = ProductRepository(config)
+        with _repository_lock:
+            if _repository_instance is None:
+                _repository_instance = ProductRepository(config)
     return _repository_instance
 
 
 def reload_product_repository() -> None:
     """Reload global product repository from configuration."""
     global _repository_instance
-    if _repository_instance:
-        _repository_instance.reload()
-    else:
-        _repository_instance = ProductRepository()
+    with _repository_lock:
+        if _repository_instance:
+            _repository_instance.reload()
+        else:
+            _repository_instance = ProductRepository()
@@ -4,7 +4,8 @@ Thread-safe dictionary-based storage.
 """
 
 import threading
-from typing import Dict, List, Optional
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from iap_emulator.models.purchase import ProductPurchaseRecord
 
@@ -15,17 +16,62 @@ class PurchaseNotFoundError(Exception):
     pass
 
 
+# Fields with a secondary index, in the order of PurchaseStore._indexes
+_index_keys = attrgetter("user_id", "package_name", "product_id", "order_id")
+
+
 class PurchaseStore:
     """In-memory storage for one-time product purchases.
 
     Thread-safe storage with lookup by token, user_id, package_name, and product_id.
+    Lookups by user, package, product and order ID use secondary indexes that map each value
+    to the tokens having it, kept in insertion order.
+
+    get_by_token, find_by_token, exists and count do not take the lock. Each is a
+    single operation on the token dict, which is atomic under the GIL, and writers
+    update that dict in one step.
     """
 
     def __init__(self):
         """Initialize purchase store with empty storage."""
         self._purchases: Dict[str, ProductPurchaseRecord] = {}
+        self._by_user: Dict[str, Dict[str, None]] = {}
+        self._by_package: Dict[str, Dict[str, None]] = {}
+        self._by_product: Dict[str, Dict[str, None]] = {}
+        self._by_order: Dict[str, Dict[str, None]] = {}
+        self._indexes = (self._by_user, self._by_package, self._by_product, self._by_order)
+        # Index keys each token is currently filed under
+        self._indexed_keys: Dict[str, Tuple[str, str, str, str]] = {}
         self._lock = threading.RLock()
 
+    def _index(self, purchase: ProductPurchaseRecord) -> None:
+        """Add a purchase to the secondary indexes, moving it if its keys changed.
+
+        Must be called with the lock held.
+        """
+        token = purchase.token
+        keys = _index_keys(purchase)
+        old_keys = self._indexed_keys.get(token)
+        if old_keys == keys:
+            return
+        if old_keys is not None:
+            self._unindex(token)
+        self._indexed_keys[token] = keys
+        for index, key in zip(self._indexes, keys):
+            index.setdefault(key, {})[token] = None
+
+    def _unindex(self, token: str) -> None:
+        """Remove a token from the secondary indexes.
+
+        Must be called with the lock held.
+        """
+        keys = self._indexed_keys.pop(token)
+        for index, key in zip(self._indexes, keys):
+            tokens = index[key]
+            del tokens[token]
+            if not tokens:
+                del index[key]
+
     def add(self, purchase: ProductPurchaseRecord) -> None:
         """Add a purchase to the store.
 
@@ -41,6 +87,31 @@ class PurchaseStore:
                     f"Purchase with token '{purchase.token}' already exists"
                 )
             self._purchases[purchase.token] = purchase
+            self._index(purchase)
+
+    def add_many(self, purchases: Iterable[ProductPurchaseRecord]) -> None:
+        """Add several purchases to the store under a single lock acquisition.
+
+        Either every purchase is added or, if any token is already taken, none are.
+
+        Args:
+            purchases: ProductPurchaseRecord objects to store
+
+        Raises:
+            ValueError: If a purchase token already exists or appears more than once
+        """
+        purchases = list(purchases)
+        with self._lock:
+            tokens = set()
+            for purchase in purchases:
+                if purchase.token in self._purchases or purchase.token in tokens:
+                    raise ValueError(
+                        f"Purchase with token '{purchase.token}' already exists"
+                    )
+                tokens.add(purchase.token)
+            for purchase in purchases:
+                self._purchases[purchase.token] = purchase
+                self._index(purchase)
 
     def get_by_token(self, token: str) -> ProductPurchaseRecord:
         """Get purchase by token.
@@ -54,13 +125,10 @@ class PurchaseStore:
         Raises:
             PurchaseNotFoundError: If token not found
         """
-        with self._lock:
-            purchase = self._purchases.get(token)
-            if purchase is None:
-                raise PurchaseNotFoundError(
-                    f"Purchase not found for token: {token}"
-                )
-            return purchase
+        purchase = self._purchases.get(token)
+        if purchase is None:
+            raise PurchaseNotFoundError(f"Purchase not found for token: {token}")
+        return purchase
 
     def find_by_token(self, token: str) -> Optional[ProductPurchaseRecord]:
         """Find purchase by token (returns None if not found).
@@ -71,8 +139,7 @@ class PurchaseStore:
         Returns:
             ProductPurchaseRecord if found, None otherwise
         """
-        with self._lock:
-            return self._purchases.get(token)
+        return self._purchases.get(token)
 
     def get_by_user(self, user_id: str) -> List[ProductPurchaseRecord]:
         """Get all purchases for a specific user.
@@ -84,7 +151,8 @@ class PurchaseStore:
             List of ProductPurchaseRecord objects for the user
         """
         with self._lock:
-            return [p for p in self._purchases.values() if p.user_id == user_id]
+            purchases = self._purchases
+            return [purchases[token] for token in self._by_user.get(user_id, ())]
 
     def get_by_package(self, package_name: str) -> List[ProductPurchaseRecord]:
         """Get all purchases for a specific package.
@@ -96,9 +164,8 @@ class PurchaseStore:
             List of ProductPurchaseRecord objects for the package
         """
         with self._lock:
-            return [
-                p for p in self._purchases.values() if p.package_name == package_name
-            ]
+            purchases = self._purchases
+            return [purchases[token] for token in self._by_package.get(package_name, ())]
 
     def get_by_product_id(self, product_id: str) -> List[ProductPurchaseRecord]:
         """Get all purchases for a specific product.
@@ -110,7 +177,8 @@ class PurchaseStore:
             List of ProductPurchaseRecord objects for the product
         """
         with self._lock:
-            return [p for p in self._purchases.values() if p.product_id == product_id]
+            purchases = self._purchases
+            return [purchases[token] for token in self._by_product.get(product_id, ())]
 
     def get_by_order_id(self, order_id: str) -> ProductPurchaseRecord:
         """Get purchase by order ID.
@@ -125,10 +193,10 @@ class PurchaseStore:
             PurchaseNotFoundError: If order ID not found
         """
         with self._lock:
-            for purchase in self._purchases.values():
-                if purchase.order_id == order_id:
-                    return purchase
-            raise PurchaseNotFoundError(f"Purchase not found for order ID: {order_id}")
+            tokens = self._by_order.get(order_id)
+            if not tokens:
+                raise PurchaseNotFoundError(f"Purchase not found for order ID: {order_id}")
+            return self._purchases[next(iter(tokens))]
 
     def find_by_order_id(self, order_id: str) -> Optional[ProductPurchaseRecord]:
         """Find purchase by order ID (returns None if not found).
@@ -140,10 +208,10 @@ class PurchaseStore:
             ProductPurchaseRecord if found, None otherwise
         """
         with self._lock:
-            for purchase in self._purchases.values():
-                if purchase.order_id == order_id:
-                    return purchase
-            return None
+            tokens = self._by_order.get(order_id)
+            if not tokens:
+                return None
+            return self._purchases[next(iter(tokens))]
 
     def get_user_purchase(
         self, user_id: str, product_id: str, package_name: str
@@ -159,12 +227,9 @@ class PurchaseStore:
             ProductPurchaseRecord if found, None otherwise
         """
         with self._lock:
-            for purchase in self._purchases.values():
-                if (
-                    purchase.user_id == user_id
-                    and purchase.product_id == product_id
-                    and purchase.package_name == package_name
-                ):
+            for token in self._by_user.get(user_id, ()):
+                purchase = self._purchases[token]
+                if purchase.product_id == product_id and purchase.package_name == package_name:
                     return purchase
             return None
 
@@ -183,6 +248,7 @@ class PurchaseStore:
                     f"Purchase not found for token: {purchase.token}"
                 )
             self._purchases[purchase.token] = purchase
+            self._index(purchase)
 
     def upsert(self, purchase: ProductPurchaseRecord) -> None:
         """Add or update a purchase (insert or update).
@@ -192,6 +258,7 @@ class PurchaseStore:
         """
         with self._lock:
             self._purchases[purchase.token] = purchase
+            self._index(purchase)
 
     def remove(self, token: str) -> None:
         """Remove a purchase from the store.
@@ -206,6 +273,7 @@ class PurchaseStore:
             if token not in self._purchases:
                 raise PurchaseNotFoundError(f"Purchase not found for token: {token}")
             del self._purchases[token]
+            self._unindex(token)
 
     def delete_by_token(self, token: str) -> bool:
         """Delete a purchase by token (returns success status).
@@ -219,6 +287,7 @@ class PurchaseStore:
         with self._lock:
             if token in self._purchases:
                 del self._purchases[token]
+                self._unindex(token)
                 return True
             return False
 
@@ -231,8 +300,7 @@ class PurchaseStore:
         Returns:
             True if purchase exists, False otherwise
         """
-        with self._lock:
-            return token in self._purchases
+        return token in self._purchases
 
     def get_all(self) -> List[ProductPurchaseRecord]:
         """Get all purchases in the store.
@@ -258,8 +326,7 @@ class PurchaseStore:
         Returns:
             Count of purchases
         """
-        with self._lock:
-            return len(self._purchases)
+        return len(self._purchases)
 
     def count_by_user(self, user_id: str) -> int:
         """Get count of purchases for a specific user.
@@ -271,7 +338,7 @@ class PurchaseStore:
             Count of purchases for the user
         """
         with self._lock:
-            return sum(1 for p in self._purchases.values() if p.user_id == user_id)
+            return len(self._by_user.get(user_id, ()))
 
     def clear(self) -> None:
         """Clear all purchases from the store.
@@ -280,6 +347,9 @@ class PurchaseStore:
         """
         with self._lock:
             self._purchases.clear()
+            self._indexed_keys.clear()
+            for index in self._indexes:
+                index.clear()
 
     def get_statistics(self) -> Dict[str, int]:
         """Get purchase store statistics.
@@ -292,30 +362,28 @@ class PurchaseStore:
             - unique_packages: Number of unique packages
         """
         with self._lock:
-            purchases = list(self._purchases.values())
             return {
-                "total_purchases": len(purchases),
-                "unique_users": len(set(p.user_id for p in purchases)),
-                "unique_products": len(set(p.product_id for p in purchases)),
-                "unique_packages": len(set(p.package_name for p in purchases)),
+                "total_purchases": len(self._purchases),
+                "unique_users": len(self._by_user),
+                "unique_products": len(self._by_product),
+                "unique_packages": len(self._by_package),
             }
 
     def __len__(self) -> int:
         """Get number of purchases in store."""
-        return self.count()
+        return len(self._purchases)
 
     def __contains__(self, token: str) -> bool:
         """Check if token exists in store."""
-        return self.exists(token)
+        return token in self._purchases
 
     def __repr__(self) -> str:
         """String representation of store."""
-        return f"PurchaseStore(purchases={self.count()})"
+        return f"PurchaseStore(purchases={len(self._purchases)})"
 
 
-# Global store instance
-_store_instance: Optional[PurchaseStore] = None
-_store_lock = threading.Lock()
+# Global store instance, created at import (module import is already thread-safe)
+_store_instance = PurchaseStore()
 
 
 def get_purchase_store() -> PurchaseStore:
@@ -324,11 +392,6 @@ def get_purchase_store() -> PurchaseStore:
     Returns:
         PurchaseStore instance
     """
-    global _store_instance
-    if _store_instance is None:
-        with _store_lock:
-            if _store_instance is None:
-                _store_instance = PurchaseStore()
     return _store_instance
 
 
@@ -337,6 +400,4 @@ def reset_purchase_store() -> None:
 
     Warning: This removes all purchase data. Use with caution.
     """
-    global _store_instance
-    store = get_purchase_store()
-    store.clear()
+    _store_instance.clear()
@@ -4,7 +4,9 @@ Manages subscription records, renewal dates, and state transitions.
 """
 
 import threading
-from typing import Dict, List, Optional
+from bisect import bisect_left, insort
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from iap_emulator.models.subscription import SubscriptionRecord, SubscriptionState
 
@@ -15,18 +17,119 @@ class SubscriptionNotFoundError(Exception):
     pass
 
 
+# Fields with a secondary index, in the order of SubscriptionStore._indexes
+_index_keys = attrgetter("user_id", "package_name", "subscription_id", "order_id")
+
+
 class SubscriptionStore:
     """In-memory storage for subscription records.
 
     Thread-safe storage with lookup by token, user_id, package_name, subscription_id,
     and subscription state. Supports time-based queries for renewals and expirations.
+    Lookups by user, package, subscription ID and order ID use secondary indexes that
+    map each value to the tokens having it, kept in insertion order. Expiry queries use a list
+    of (expiry_time_millis, token) pairs kept sorted, so records must be passed to
+    update() after their expiry changes.
+
+    get_by_token, find_by_token, exists and count do not take the lock. Each is a
+    single operation on the token dict, which is atomic under the GIL, and writers
+    update that dict in one step.
     """
 
     def __init__(self):
         """Initialize subscription store with empty storage."""
         self._subscriptions: Dict[str, SubscriptionRecord] = {}
+        self._by_user: Dict[str, Dict[str, None]] = {}
+        self._by_package: Dict[str, Dict[str, None]] = {}
+        self._by_subscription_id: Dict[str, Dict[str, None]] = {}
+        self._by_order: Dict[str, Dict[str, None]] = {}
+        self._indexes = (
+            self._by_user,
+            self._by_package,
+            self._by_subscription_id,
+            self._by_order,
+        )
+        # Index keys each token is currently filed under
+        self._indexed_keys: Dict[str, Tuple[str, str, str, str]] = {}
+        self._expiry_index: List[Tuple[int, str]] = []
+        self._indexed_expiry: Dict[str, int] = {}
         self._lock = threading.RLock()
 
+    def _index(self, subscription: SubscriptionRecord) -> None:
+        """Add a subscription to the secondary indexes, moving it if its keys changed.
+
+        Must be called with the lock held.
+        """
+        token = subscription.token
+        keys = _index_keys(subscription)
+        old_keys = self._indexed_keys.get(token)
+        if old_keys != keys:
+            if old_keys is not None:
+                self._unindex_keys(token)
+            self._indexed_keys[token] = keys
+            for index, key in zip(self._indexes, keys):
+                index.setdefault(key, {})[token] = None
+        self._index_expiry(subscription)
+
+    def _unindex(self, token: str) -> None:
+        """Remove a token from the secondary indexes.
+
+        Must be called with the lock held.
+        """
+        self._unindex_keys(token)
+        self._unindex_expiry(token)
+
+    def _unindex_keys(self, token: str) -> None:
+        """Remove a token from the user, package, subscription ID and order ID indexes.
+
+        Must be called with the lock held.
+        """
+        keys = self._indexed_keys.pop(token)
+        for index, key in zip(self._indexes, keys):
+            tokens = index[key]
+            del tokens[token]
+            if not tokens:
+                del index[key]
+
+    def _index_expiry(self, subscription: SubscriptionRecord) -> None:
+        """File a subscription in the expiry index under its current expiry time.
+
+        Must be called with the lock held.
+        """
+        token = subscription.token
+        expiry = subscription.expiry_time_millis
+        old_expiry = self._indexed_expiry.get(token)
+        if old_expiry == expiry:
+            return
+        if old_expiry is not None:
+            self._unindex_expiry(token)
+        self._indexed_expiry[token] = expiry
+        insort(self._expiry_index, (expiry, token))
+
+    def _unindex_expiry(self, token: str) -> None:
+        """Remove a token from the expiry index.
+
+        Must be called with the lock held.
+        """
+        expiry = self._indexed_expiry.pop(token)
+        del self._expiry_index[bisect_left(self._expiry_index, (expiry, token))]
+
+    def _expiring_by(self, before_millis: int) -> List[SubscriptionRecord]:
+        """Get subscriptions expiring at or before a time, ordered by expiry.
+
+        Records are checked against their current expiry, so one extended in place
+        but not yet passed to update() is not returned early.
+
+        Must be called with the lock held.
+        """
+        end = bisect_left(self._expiry_index, (before_millis + 1, ""))
+        expiring = []
+        for _, token in self._expiry_index[:end]:
+            subscription = self._subscriptions[token]
+            if subscription.expiry_time_millis <= before_millis:
+                expiring.append(subscription)
+        return expiring
+
     def add(self, subscription: SubscriptionRecord) -> None:
         """Add a subscription to the store.
 
@@ -42,6 +145,31 @@ class SubscriptionStore:
                     f"Subscription with token '{subscription.token}' already exists"
                 )
             self._subscriptions[subscription.token] = subscription
+            self._index(subscription)
+
+    def add_many(self, subscriptions: Iterable[SubscriptionRecord]) -> None:
+        """Add several subscriptions to the store under a single lock acquisition.
+
+        Either every subscription is added or, if any token is already taken, none are.
+
+        Args:
+            subscriptions: SubscriptionRecord objects to store
+
+        Raises:
+            ValueError: If a subscription token already exists or appears more than once
+        """
+        subscriptions = list(subscriptions)
+        with self._lock:
+            tokens = set()
+            for subscription in subscriptions:
+                if subscription.token in self._subscriptions or subscription.token in tokens:
+                    raise ValueError(
+                        f"Subscription with token '{subscription.token}' already exists"
+                    )
+                tokens.add(subscription.token)
+            for subscription in subscriptions:
+                self._subscriptions[subscription.token] = subscription
+                self._index(subscription)
 
     def get_by_token(self, token: str) -> SubscriptionRecord:
         """Get subscription by token.
@@ -55,13 +183,10 @@ class SubscriptionStore:
         Raises:
             SubscriptionNotFoundError: If token not found
         """
-        with self._lock:
-            subscription = self._subscriptions.get(token)
-            if subscription is None:
-                raise SubscriptionNotFoundError(
-                    f"Subscription not found for token: {token}"
-                )
-            return subscription
+        subscription = self._subscriptions.get(token)
+        if subscription is None:
+            raise SubscriptionNotFoundError(f"Subscription not found for token: {token}")
+        return subscription
 
     def find_by_token(self, token: str) -> Optional[SubscriptionRecord]:
         """Find subscription by token (returns None if not found).
@@ -72,20 +197,28 @@ class SubscriptionStore:
         Returns:
             SubscriptionRecord if found, None otherwise
         """
-        with self._lock:
-            return self._subscriptions.get(token)
+        return self._subscriptions.get(token)
 
-    def get_by_user(self, user_id: str) -> List[SubscriptionRecord]:
+    def get_by_user(
+        self, user_id: str, package_name: Optional[str] = None
+    ) -> List[SubscriptionRecord]:
         """Get all subscriptions for a specific user.
 
         Args:
             user_id: User identifier
+            package_name: Optional package name filter
 
         Returns:
             List of SubscriptionRecord objects for the user
         """
         with self._lock:
-            return [s for s in self._subscriptions.values() if s.user_id == user_id]
+            subscriptions = self._subscriptions
+            tokens = self._by_user.get(user_id, ())
+            if package_name is None:
+                return [subscriptions[token] for token in tokens]
+            # Filter on the package index's token set instead of each record
+            package_tokens = self._by_package.get(package_name, ())
+            return [subscriptions[token] for token in tokens if token in package_tokens]
 
     def get_by_package(self, package_name: str) -> List[SubscriptionRecord]:
         """Get all subscriptions for a specific package.
@@ -97,9 +230,8 @@ class SubscriptionStore:
             List of SubscriptionRecord objects for the package
         """
         with self._lock:
-            return [
-                s for s in self._subscriptions.values() if s.package_name == package_name
-            ]
+            subscriptions = self._subscriptions
+            return [subscriptions[token] for token in self._by_package.get(package_name, ())]
 
     def get_by_subscription_id(self, subscription_id: str) -> List[SubscriptionRecord]:
         """Get all subscriptions for a specific subscription product.
@@ -111,10 +243,10 @@ class SubscriptionStore:
             List of SubscriptionRecord objects for the subscription product
         """
         with self._lock:
+            subscriptions = self._subscriptions
             return [
-                s
-                for s in self._subscriptions.values()
-                if s.subscription_id == subscription_id
+                subscriptions[token]
+                for token in self._by_subscription_id.get(subscription_id, ())
             ]
 
     def get_by_order_id(self, order_id: str) -> SubscriptionRecord:
@@ -130,10 +262,10 @@ class SubscriptionStore:
             SubscriptionNotFoundError: If order ID not found
         """
         with self._lock:
-            for subscription in self._subscriptions.values():
-                if subscription.order_id == order_id:
-                    return subscription
-            raise SubscriptionNotFoundError(f"Subscription not found for order ID: {order_id}")
+            tokens = self._by_order.get(order_id)
+            if not tokens:
+                raise SubscriptionNotFoundError(f"Subscription not found for order ID: {order_id}")
+            return self._subscriptions[next(iter(tokens))]
 
     def find_by_order_id(self, order_id: str) -> Optional[SubscriptionRecord]:
         """Find subscription by order ID (returns None if not found).
@@ -145,10 +277,10 @@ class SubscriptionStore:
             SubscriptionRecord if found, None otherwise
         """
         with self._lock:
-            for subscription in self._subscriptions.values():
-                if subscription.order_id == order_id:
-                    return subscription
-            return None
+            tokens = self._by_order.get(order_id)
+            if not tokens:
+                return None
+            return self._subscriptions[next(iter(tokens))]
 
     def get_user_subscription(
         self, user_id: str, subscription_id: str, package_name: str
@@ -164,10 +296,10 @@ class SubscriptionStore:
             SubscriptionRecord if found, None otherwise
         """
         with self._lock:
-            for subscription in self._subscriptions.values():
+            for token in self._by_user.get(user_id, ()):
+                subscription = self._subscriptions[token]
                 if (
-                    subscription.user_id == user_id
-                    and subscription.subscription_id == subscription_id
+                    subscription.subscription_id == subscription_id
                     and subscription.package_name == package_name
                 ):
                     return subscription
@@ -200,14 +332,11 @@ class SubscriptionStore:
             before_millis: Unix timestamp in milliseconds
 
         Returns:
-            List of SubscriptionRecord objects expiring before the given time
+            List of SubscriptionRecord objects expiring before the given time,
+            ordered by expiry time
         """
         with self._lock:
-            return [
-                s
-                for s in self._subscriptions.values()
-                if s.expiry_time_millis <= before_millis
-            ]
+            return self._expiring_by(before_millis)
 
     def get_renewals_due(self, at_time_millis: int) -> List[SubscriptionRecord]:
         """Get subscriptions due for renewal at a specific time.
@@ -218,15 +347,13 @@ class SubscriptionStore:
             at_time_millis: Unix timestamp in milliseconds
 
         Returns:
-            List of SubscriptionRecord objects due for renewal
+            List of SubscriptionRecord objects due for renewal, ordered by expiry time
         """
         with self._lock:
             return [
                 s
-                for s in self._subscriptions.values()
-                if s.state == SubscriptionState.ACTIVE
-                and s.auto_renewing
-                and s.expiry_time_millis <= at_time_millis
+                for s in self._expiring_by(at_time_millis)
+                if s.state == SubscriptionState.ACTIVE and s.auto_renewing
             ]
 
     def get_in_trial(self) -> List[SubscriptionRecord]:
@@ -269,6 +396,29 @@ class SubscriptionStore:
                     f"Subscription not found for token: {subscription.token}"
                 )
             self._subscriptions[subscription.token] = subscription
+            self._index(subscription)
+
+    def update_many(self, subscriptions: Iterable[SubscriptionRecord]) -> None:
+        """Update several existing subscriptions under a single lock acquisition.
+
+        Either every subscription is updated or, if any token is unknown, none are.
+
+        Args:
+            subscriptions: Updated SubscriptionRecord objects
+
+        Raises:
+            SubscriptionNotFoundError: If a subscription token is not found
+        """
+        subscriptions = list(subscriptions)
+        with self._lock:
+            for subscription in subscriptions:
+                if subscription.token not in self._subscriptions:
+                    raise SubscriptionNotFoundError(
+                        f"Subscription not found for token: {subscription.token}"
+                    )
+            for subscription in subscriptions:
+                self._subscriptions[subscription.token] = subscription
+                self._index(subscription)
 
     def upsert(self, subscription: SubscriptionRecord) -> None:
         """Add or update a subscription (insert or update).
@@ -278,6 +428,7 @@ class SubscriptionStore:
         """
         with self._lock:
             self._subscriptions[subscription.token] = subscription
+            self._index(subscription)
 
     def remove(self, token: str) -> None:
         """Remove a subscription from the store.
@@ -294,6 +445,7 @@ class SubscriptionStore:
                     f"Subscription not found for token: {token}"
                 )
             del self._subscriptions[token]
+            self._unindex(token)
 
     def delete_by_token(self, token: str) -> bool:
         """Delete a subscription by token (returns success status).
@@ -307,6 +459,7 @@ class SubscriptionStore:
         with self._lock:
             if token in self._subscriptions:
                 del self._subscriptions[token]
+                self._unindex(token)
                 return True
             return False
 
@@ -319,8 +472,7 @@ class SubscriptionStore:
         Returns:
             True if subscription exists, False otherwise
         """
-        with self._lock:
-            return token in self._subscriptions
+        return token in self._subscriptions
 
     def get_all(self) -> List[SubscriptionRecord]:
         """Get all subscriptions in the store.
@@ -346,8 +498,7 @@ class SubscriptionStore:
         Returns:
             Count of subscriptions
         """
-        with self._lock:
-            return len(self._subscriptions)
+        return len(self._subscriptions)
 
     def count_by_user(self, user_id: str) -> int:
         """Get count of subscriptions for a specific user.
@@ -359,7 +510,7 @@ class SubscriptionStore:
             Count of subscriptions for the user
         """
         with self._lock:
-            return sum(1 for s in self._subscriptions.values() if s.user_id == user_id)
+            return len(self._by_user.get(user_id, ()))
 
     def count_by_state(self, state: SubscriptionState) -> int:
         """Get count of subscriptions in a specific state.
@@ -380,6 +531,11 @@ class SubscriptionStore:
         """
         with self._lock:
             self._subscriptions.clear()
+            self._indexed_keys.clear()
+            for index in self._indexes:
+                index.clear()
+            self._expiry_index.clear()
+            self._indexed_expiry.clear()
 
     def get_statistics(self) -> Dict[str, int]:
         """Get subscription store statistics.
@@ -400,42 +556,45 @@ class SubscriptionStore:
             - auto_renewing: Count with auto-renew enabled
         """
         with self._lock:
-            subscriptions = list(self._subscriptions.values())
+            state_counts = dict.fromkeys(SubscriptionState, 0)
+            in_trial = auto_renewing = 0
+            for subscription in self._subscriptions.values():
+                state_counts[subscription.state] += 1
+                if subscription.in_trial:
+                    in_trial += 1
+                if subscription.auto_renewing:
+                    auto_renewing += 1
+
             return {
-                "total_subscriptions": len(subscriptions),
-                "unique_users": len(set(s.user_id for s in subscriptions)),
-                "unique_subscription_ids": len(
-                    set(s.subscription_id for s in subscriptions)
-                ),
-                "unique_packages": len(set(s.package_name for s in subscriptions)),
-                "active": sum(1 for s in subscriptions if s.state == SubscriptionState.ACTIVE),
-                "canceled": sum(1 for s in subscriptions if s.state == SubscriptionState.CANCELED),
-                "expired": sum(1 for s in subscriptions if s.state == SubscriptionState.EXPIRED),
-                "in_grace_period": sum(
-                    1 for s in subscriptions if s.state == SubscriptionState.IN_GRACE_PERIOD
-                ),
-                "on_hold": sum(1 for s in subscriptions if s.state == SubscriptionState.ON_HOLD),
-                "paused": sum(1 for s in subscriptions if s.state == SubscriptionState.PAUSED),
-                "in_trial": sum(1 for s in subscriptions if s.in_trial),
-                "auto_renewing": sum(1 for s in subscriptions if s.auto_renewing),
+                "total_subscriptions": len(self._subscriptions),
+                "unique_users": len(self._by_user),
+                "unique_subscription_ids": len(self._by_subscription_id),
+                "unique_packages": len(self._by_package),
+                "active": state_counts[SubscriptionState.ACTIVE],
+                "canceled": state_counts[SubscriptionState.CANCELED],
+                "expired": state_counts[SubscriptionState.EXPIRED],
+                "in_grace_period": state_counts[SubscriptionState.IN_GRACE_PERIOD],
+                "on_hold": state_counts[SubscriptionState.ON_HOLD],
+                "paused": state_counts[SubscriptionState.PAUSED],
+                "in_trial": in_trial,
+                "auto_renewing": auto_renewing,
             }
 
     def __len__(self) -> int:
         """Get number of subscriptions in store."""
-        return self.count()
+        return len(self._subscriptions)
 
     def __contains__(self, token: str) -> bool:
         """Check if token exists in store."""
-        return self.exists(token)
+        return token in self._subscriptions
 
     def __repr__(self) -> str:
         """String representation of store."""
-        return f"SubscriptionStore(subscriptions={self.count()})"
+        return f"SubscriptionStore(subscriptions={len(self._subscriptions)})"
 
 
-# Global store instance
-_store_instance: Optional[SubscriptionStore] = None
-_store_lock = threading.Lock()
+# Global store instance, created at import (module import is already thread-safe)
+_store_instance = SubscriptionStore()
 
 
 def get_subscription_store() -> SubscriptionStore:
@@ -444,11 +603,6 @@ def get_subscription_store() -> SubscriptionStore:
     Returns:
         SubscriptionStore instance
     """
-    global _store_instance
-    if _store_instance is None:
-        with _store_lock:
-            if _store_instance is None:
-                _store_instance = SubscriptionStore()
     return _store_instance
 
 
@@ -457,6 +611,4 @@ def reset_subscription_store() -> None:
 
     Warning: This removes all subscription data. Use with caution.
     """
-    global _store_instance
-    store = get_subscription_store()
-    store.clear()
+    _store_instance.clear()
@@ -7,10 +7,10 @@ Responsibilities:
 - Manage Pub/Sub client lifecycle
 """
 
-from threading import RLock
-from typing import Optional
-
-from google.cloud import pubsub_v1
+import time
+from concurrent.futures import Future
+from threading import Lock
+from typing import TYPE_CHECKING, Optional, Set
 
 from iap_emulator.logging_config import get_logger
 from iap_emulator.models.events import (
@@ -22,6 +22,9 @@ from iap_emulator.models.subscription import NotificationType
 from iap_emulator.repositories.product_repository import get_product_repository
 from iap_emulator.services.time_controller import get_time_controller
 
+if TYPE_CHECKING:
+    from google.cloud import pubsub_v1
+
 logger = get_logger(__name__)
 
 
@@ -37,8 +40,12 @@ class EventDispatcher:
 
     def __init__(self):
         """initialize event dispatcher"""
-        self._lock = RLock()
-        self._publisher: Optional[pubsub_v1.PublisherClient] = None
+        self._lock = Lock()
+        self._publisher: Optional["pubsub_v1.PublisherClient"] = None
+        self._subscriber: Optional["pubsub_v1.SubscriberClient"] = None
+        # Publishes handed to the client that Pub/Sub has not confirmed yet
+        self._pending: Set[Future] = set()
+        self._pending_lock = Lock()
         self._topic_path: Optional[str] = None
         self._enabled = False
         self._product_repo = get_product_repository()
@@ -57,7 +64,26 @@ class EventDispatcher:
             return
 
         try:
-            self._publisher = pubsub_v1.PublisherClient()
+            # Imported here so the gRPC client stack is only loaded when RTDN is enabled
+            from google.cloud import pubsub_v1
+
+            self._publisher = pubsub_v1.PublisherClient(
+                # Send a batch after 10ms so single events are not held back
+                batch_settings=pubsub_v1.types.BatchSettings(
+                    max_messages=100,
+                    max_bytes=1024 * 1024,
+                    max_latency=0.01,
+                ),
+                # Publishes are not awaited, so block callers rather than
+                # buffer without limit if Pub/Sub falls behind
+                publisher_options=pubsub_v1.types.PublisherOptions(
+                    flow_control=pubsub_v1.types.PublishFlowControl(
+                        message_limit=1000,
+                        byte_limit=10 * 1024 * 1024,
+                        limit_exceeded_behavior=pubsub_v1.types.LimitExceededBehavior.BLOCK,
+                    ),
+                ),
+            )
 
             project_id = config.pubsub_project_id
             topic_name = config.pubsub_topic
@@ -97,34 +123,33 @@ class EventDispatcher:
         if not self._publisher:
             return
 
+        from google.api_core.exceptions import AlreadyExists
+
         topic_path = self._publisher.topic_path(project_id, topic_name)
 
+        # Create directly and treat AlreadyExists as success, saving a lookup RPC
         try:
-            # Try to get the topic first
-            self._publisher.get_topic(request={"topic": topic_path})
+            topic = self._publisher.create_topic(request={"name": topic_path})
+            logger.info(
+                "pubsub_topic_created",
+                topic=topic_name,
+                topic_path=topic.name,
+            )
+        except AlreadyExists:
             logger.info(
                 "pubsub_topic_exists",
                 topic=topic_name,
                 topic_path=topic_path,
             )
-        except Exception:
-            # Topic doesn't exist, create it
-            try:
-                topic = self._publisher.create_topic(request={"name": topic_path})
-                logger.info(
-                    "pubsub_topic_created",
-                    topic=topic_name,
-                    topic_path=topic.name,
-                )
-            except Exception as e:
-                logger.error(
-                    "pubsub_topic_create_failed",
-                    topic=topic_name,
-                    error=str(e),
-                    error_type=type(e).__name__,
-                    exc_info=True,
-                )
-                raise
+        except Exception as e:
+            logger.error(
+                "pubsub_topic_create_failed",
+                topic=topic_name,
+                error=str(e),
+                error_type=type(e).__name__,
+                exc_info=True,
+            )
+            raise
 
     def _ensure_subscription_exists(self, project_id: str, topic_name: str, subscription_name: str) -> None:
         """Ensure Pub/Sub subscription exists, create if it doesn't.
@@ -137,42 +162,46 @@ class EventDispatcher:
         if not self._publisher:
             return
 
-        subscriber = pubsub_v1.SubscriberClient()
+        from google.api_core.exceptions import AlreadyExists
+
+        # Created once and kept, so each call does not open another gRPC channel
+        if self._subscriber is None:
+            from google.cloud import pubsub_v1
+
+            self._subscriber = pubsub_v1.SubscriberClient()
+        subscriber = self._subscriber
         topic_path = self._publisher.topic_path(project_id, topic_name)
         subscription_path = subscriber.subscription_path(project_id, subscription_name)
 
+        # Create directly and treat AlreadyExists as success, saving a lookup RPC
         try:
-            # Try to get the subscription first
-            subscriber.get_subscription(request={"subscription": subscription_path})
+            subscription = subscriber.create_subscription(
+                request={
+                    "name": subscription_path,
+                    "topic": topic_path,
+                }
+            )
+            logger.info(
+                "pubsub_subscription_created",
+                subscription=subscription_name,
+                subscription_path=subscription.name,
+                topic=topic_path,
+            )
+        except AlreadyExists:
             logger.info(
                 "pubsub_subscription_exists",
                 subscription=subscription_name,
                 subscription_path=subscription_path,
             )
-        except Exception:
-            # Subscription doesn't exist, create it
-            try:
-                subscription = subscriber.create_subscription(
-                    request={
-                        "name": subscription_path,
-                        "topic": topic_path,
-                    }
-                )
-                logger.info(
-                    "pubsub_subscription_created",
-                    subscription=subscription_name,
-                    subscription_path=subscription.name,
-                    topic=topic_path,
-                )
-            except Exception as e:
-                logger.error(
-                    "pubsub_subscription_create_failed",
-                    subscription=subscription_name,
-                    error=str(e),
-                    error_type=type(e).__name__,
-                    exc_info=True,
-                )
-                raise
+        except Exception as e:
+            logger.error(
+                "pubsub_subscription_create_failed",
+                subscription=subscription_name,
+                error=str(e),
+                error_type=type(e).__name__,
+                exc_info=True,
+            )
+            raise
 
     def is_enabled(self) -> bool:
         """Check if event dispatcher is enabled.
@@ -198,56 +227,55 @@ class EventDispatcher:
             package_name: Android package name
 
         Returns:
-            True if published successfully, False otherwise
+            True if the event was handed to the publisher, False otherwise
         """
         if not self.is_enabled():
             logger.debug("event_dispatcher_disabled", message="Skipping event publication")
             return False
 
-        with self._lock:
-            try:
-                # Get current time
-                current_time = self._time_controller.get_current_time_millis()
-
-                # Create subscription notification
-                sub_notification = SubscriptionNotification(
-                    version="1.0",
-                    notification_type=notification_type.value,
-                    purchase_token=purchase_token,
-                    subscription_id=subscription_id,
-                )
-
-                # Create developer notification
-                dev_notification = DeveloperNotification(
-                    version="1.0",
-                    package_name=package_name,
-                    event_time_millis=current_time,
-                    subscription_notification=sub_notification,
-                )
-
-                # Publish to Pub/Sub
-                self._publish_notification(dev_notification)
-
-                logger.info(
-                    "subscription_event_published",
-                    notification_type=notification_type.name,
-                    notification_type_value=notification_type.value,
-                    subscription_id=subscription_id,
-                    token=purchase_token[:16] + "...",
-                )
-
-                return True
-
-            except Exception as e:
-                logger.error(
-                    "subscription_event_publish_failed",
-                    notification_type=notification_type.name,
-                    subscription_id=subscription_id,
-                    error=str(e),
-                    error_type=type(e).__name__,
-                    exc_info=True,
-                )
-                return False
+        try:
+            # Get current time
+            current_time = self._time_controller.get_current_time_millis()
+
+            # Create subscription notification
+            sub_notification = SubscriptionNotification(
+                version="1.0",
+                notification_type=notification_type.value,
+                purchase_token=purchase_token,
+                subscription_id=subscription_id,
+            )
+
+            # Create developer notification
+            dev_notification = DeveloperNotification(
+                version="1.0",
+                package_name=package_name,
+                event_time_millis=current_time,
+                subscription_notification=sub_notification,
+            )
+
+            # Publish to Pub/Sub
+            self._publish_notification(dev_notification, notification_type.value)
+
+            logger.info(
+                "subscription_event_published",
+                notification_type=notification_type.name,
+                notification_type_value=notification_type.value,
+                subscription_id=subscription_id,
+                token=purchase_token[:16] + "...",
+            )
+
+            return True
+
+        except Exception as e:
+            logger.error(
+                "subscription_event_publish_failed",
+                notification_type=notification_type.name,
+                subscription_id=subscription_id,
+                error=str(e),
+                error_type=type(e).__name__,
+                exc_info=True,
+            )
+            return False
 
     def publish_product_event(
             self,
@@ -265,89 +293,109 @@ class EventDispatcher:
             package_name: Android package name
 
         Returns:
-            True if published successfully, False otherwise
+            True if the event was handed to the publisher, False otherwise
         """
         if not self.is_enabled():
             logger.debug("event_dispatcher_disabled", message="Skipping event publication")
             return False
 
-        with self._lock:
-            try:
-                # Get current time
-                current_time = self._time_controller.get_current_time_millis()
-
-                # Create product notification
-                product_notification = OneTimeProductNotification(
-                    version="1.0",
-                    notification_type=notification_type,
-                    purchase_token=purchase_token,
-                    sku=product_id,
-                )
-
-                # Create developer notification
-                dev_notification = DeveloperNotification(
-                    version="1.0",
-                    package_name=package_name,
-                    event_time_millis=current_time,
-                    one_time_product_notification=product_notification,
-                )
-
-                # Publish to Pub/Sub
-                self._publish_notification(dev_notification)
-
-                logger.info(
-                    "product_event_published",
-                    notification_type=notification_type,
-                    product_id=product_id,
-                    token=purchase_token[:16] + "...",
-                )
-
-                return True
-
-            except Exception as e:
-                logger.error(
-                    "product_event_publish_failed",
-                    notification_type=notification_type,
-                    product_id=product_id,
-                    error=str(e),
-                    error_type=type(e).__name__,
-                    exc_info=True,
-                )
-                return False
-
-    def _publish_notification(self, notification: DeveloperNotification):
+        try:
+            # Get current time
+            current_time = self._time_controller.get_current_time_millis()
+
+            # Create product notification
+            product_notification = OneTimeProductNotification(
+                version="1.0",
+                notification_type=notification_type,
+                purchase_token=purchase_token,
+                sku=product_id,
+            )
+
+            # Create developer notification
+            dev_notification = DeveloperNotification(
+                version="1.0",
+                package_name=package_name,
+                event_time_millis=current_time,
+                one_time_product_notification=product_notification,
+            )
+
+            # Publish to Pub/Sub
+            self._publish_notification(dev_notification, notification_type)
+
+            logger.info(
+                "product_event_published",
+                notification_type=notification_type,
+                product_id=product_id,
+                token=purchase_token[:16] + "...",
+            )
+
+            return True
+
+        except Exception as e:
+            logger.error(
+                "product_event_publish_failed",
+                notification_type=notification_type,
+                product_id=product_id,
+                error=str(e),
+                error_type=type(e).__name__,
+                exc_info=True,
+            )
+            return False
+
+    def _publish_notification(
+            self,
+            notification: DeveloperNotification,
+            notification_type: int,
+    ) -> None:
         """Publish a developer notification to Pub/Sub.
 
+        The message is handed to the publisher client without waiting for
+        Pub/Sub to confirm it, so the client can batch messages across calls.
+        The outcome is logged by _on_publish_done once the future resolves.
+
         Args:
             notification: Developer notification to publish
+            notification_type: Notification type, sent as a message attribute
 
         Raises:
-            GoogleAPIError: If publication fails after retries
+            RuntimeError: If the publisher is not initialized
         """
-        if not self._publisher or not self._topic_path:
+        # Read once so a concurrent shutdown() cannot clear them mid-call
+        publisher = self._publisher
+        topic_path = self._topic_path
+        if not publisher or not topic_path:
             raise RuntimeError("Publisher is not initialized")
 
-        # convert to json bytes
-        message_data = notification.model_dump_json().encode("utf-8")
+        # Serialize straight to JSON bytes, skipping the str round trip
+        message_data = notification.__pydantic_serializer__.to_json(notification)
 
         # publish with retry logic (automatic retries on transient errors
         # Publish with retry logic (automatic retries on transient errors)
-        future = self._publisher.publish(
-            self._topic_path,
+        future = publisher.publish(
+            topic_path,
             message_data,
             # Add attributes for filtering
-            notification_type=str(notification.subscription_notification.notification_type
-                                  if notification.subscription_notification
-                                  else notification.one_time_product_notification.notification_type
-            if notification.one_time_product_notification
-            else 0),
+            notification_type=str(notification_type),
             package_name=notification.package_name,
         )
 
-        # Wait for publish to complete (with timeout)
+        # Track the future before attaching the callback, which runs
+        # immediately if the future has already resolved
+        with self._pending_lock:
+            self._pending.add(future)
+        future.add_done_callback(self._on_publish_done)
+
+    def _on_publish_done(self, future: Future) -> None:
+        """Log the result of a publish once Pub/Sub confirms or rejects it.
+
+        Args:
+            future: Future returned by the publisher client
+        """
+        with self._pending_lock:
+            self._pending.discard(future)
+
         try:
-            message_id = future.result(timeout=5.0)
-            logger.debug("pubsub_message_published", message_id=message_id)
+            message_id = future.result()
         except Exception as e:
             logger.error(
                 "pubsub_publish_failed",
@@ -355,20 +403,52 @@ class EventDispatcher:
                 error_type=type(e).__name__,
                 exc_info=True,
             )
-            raise
+        else:
+            logger.debug("pubsub_message_published", message_id=message_id)
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait for in-flight publishes to be confirmed.
+
+        Args:
+            timeout: Maximum seconds to wait for all pending publishes
+        """
+        with self._pending_lock:
+            pending = list(self._pending)
+
+        deadline = time.monotonic() + timeout
+        for future in pending:
+            try:
+                future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except Exception:
+                # Failures are logged by _on_publish_done; timeouts are left pending
+                pass
 
     def shutdown(self) -> None:
         """Shutdown the event dispatcher and close connections."""
         with self._lock:
+            if self._subscriber:
+                self._subscriber.close()
+                self._subscriber = None
             if self._publisher:
                 logger.info("event_dispatcher_shutting_down")
-                # Note: PublisherClient doesn't have explicit close in v1
+                publisher = self._publisher
+                try:
+                    # Sends any partly filled batch and rejects further publishes
+                    publisher.stop()
+                except Exception as e:
+                    logger.warning("pubsub_publisher_stop_failed", error=str(e))
+                self.flush()
+                try:
+                    # Close the gRPC channel so repeated resets do not leak sockets
+                    publisher.transport.close()
+                except Exception as e:
+                    logger.warning("pubsub_publisher_close_failed", error=str(e))
                 self._publisher = None
                 self._topic_path = None
                 logger.info("event_dispatcher_shutdown_complete")
 
 _event_dispatcher: Optional[EventDispatcher] = None
-_dispatcher_lock = RLock()
+_dispatcher_lock = Lock()
 
 def get_event_dispatcher() -> EventDispatcher:
     """Get or create the singleton EventDispatcher instance.
@@ -3,8 +3,9 @@
 Manages one-time product purchases including creation, acknowledgment, and consumption.
 """
 
+import threading
 import time
-from typing import Optional
+from typing import Any, Iterable, Mapping, Optional
 
 from iap_emulator.models.purchase import (
     AcknowledgementState,
@@ -104,6 +105,70 @@ class PurchaseManager:
             ProductNotFoundError: If product_id not found
             ValueError: If invalid parameters
         """
+        purchase = self._build_purchase(
+            product_id,
+            package_name,
+            user_id,
+            developer_payload=developer_payload,
+            token_prefix=token_prefix,
+            order_id_prefix=order_id_prefix,
+        )
+
+        # Store purchase
+        self._purchase_store.add(purchase)
+
+        return purchase
+
+    def create_purchases(
+        self, specs: Iterable[Mapping[str, Any]]
+    ) -> list[ProductPurchaseRecord]:
+        """Create several purchases and store them together.
+
+        Each spec holds the keyword arguments of create_purchase(). All records
+        are built before any is stored, so an unknown product adds nothing.
+
+        Args:
+            specs: Keyword arguments for each purchase
+
+        Returns:
+            List of ProductPurchaseRecord, in the order of specs
+
+        Raises:
+            ProductNotFoundError: If a product_id is not found
+            ValueError: If invalid parameters
+        """
+        purchases = [self._build_purchase(**spec) for spec in specs]
+
+        # Store purchases under a single store lock acquisition
+        self._purchase_store.add_many(purchases)
+
+        return purchases
+
+    def _build_purchase(
+        self,
+        product_id: str,
+        package_name: str,
+        user_id: str,
+        developer_payload: Optional[str] = None,
+        token_prefix: Optional[str] = None,
+        order_id_prefix: str = "GPA",
+    ) -> ProductPurchaseRecord:
+        """Build a new purchase record without storing it.
+
+        Args:
+            product_id: Product ID to purchase
+            package_name: Android package name
+            user_id: User identifier
+            developer_payload: Optional developer-specified payload
+            token_prefix: Optional token prefix (defaults to config)
+            order_id_prefix: Order ID prefix
+
+        Returns:
+            ProductPurchaseRecord
+
+        Raises:
+            ProductNotFoundError: If product_id not found
+        """
         # Validate product exists
         product = self._product_repository.get_by_id(product_id)
 
@@ -112,7 +177,7 @@ class PurchaseManager:
         order_id = generate_order_id(prefix=order_id_prefix)
 
         # Get current time
-        purchase_time_millis = int(time.time() * 1000)
+        purchase_time_millis = time.time_ns() // 1000000
 
         # Get price from product definition
         price_amount_micros = product.price_micros
@@ -134,9 +199,6 @@ class PurchaseManager:
             developer_payload=developer_payload,
         )
 
-        # Store purchase
-        self._purchase_store.add(purchase)
-
         return purchase
 
     def get_purchase(self, token: str) -> ProductPurchaseRecord:
@@ -329,6 +391,7 @@ class PurchaseManager:
 
 # Global instance
 _purchase_manager: Optional[PurchaseManager] = None
+_manager_lock = threading.Lock()
 
 
 def get_purchase_manager() -> PurchaseManager:
@@ -339,11 +402,14 @@ def get_purchase_manager() -> PurchaseManager:
     """
     global _purchase_manager
     if _purchase_manager is None:
-        _purchase_manager = PurchaseManager()
+        with _manager_lock:
+            if _purchase_manager is None:
+                _purchase_manager = PurchaseManager()
     return _purchase_manager
 
 
 def reset_purchase_manager() -> None:
     """Reset global purchase manager instance (useful for testing)."""
     global _purchase_manager
-    _purchase_manager = None
+    with _manager_lock:
+        _purchase_manager = None
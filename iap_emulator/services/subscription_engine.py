@@ -9,8 +9,11 @@ Responsibilities:
 - Calculate expiry times and billing periods
 """
 
+import threading
 import time
+from contextlib import ExitStack
 from typing import Optional
+from weakref import WeakValueDictionary
 
 from iap_emulator.config import get_config
 from iap_emulator.logging_config import get_logger
@@ -26,6 +29,7 @@ from iap_emulator.repositories.product_repository import (
     get_product_repository,
 )
 from iap_emulator.repositories.subscription_store import (
+    SubscriptionNotFoundError,
     SubscriptionStore,
     get_subscription_store,
 )
@@ -37,6 +41,11 @@ from iap_emulator.utils.token_generator import (
 
 logger = get_logger(__name__)
 
+# Per-token transition locks, shared by every engine instance since they may
+# share one store. Entries are dropped once no transition holds the lock.
+_token_locks: "WeakValueDictionary[str, threading.Lock]" = WeakValueDictionary()
+_token_locks_guard = threading.Lock()
+
 
 class SubscriptionError(Exception):
     """Base exception for subscription errors."""
@@ -56,6 +65,12 @@ class SubscriptionEngine:
     Handles subscription creation, state transitions, renewals, and cancellations.
     Integrates with SubscriptionStore for persistence and ProductRepository for
     product definitions.
+
+    Each state transition reads, checks, and updates its record while holding
+    a lock for that token, so concurrent calls on one subscription cannot
+    interleave while calls on different subscriptions do not wait on each
+    other. The locks are module-wide, so engines sharing a store also share
+    them. Events are published after the lock is released.
     """
 
     def __init__(
@@ -77,6 +92,24 @@ class SubscriptionEngine:
 
         logger.info("subscription_engine_initialized")
 
+    def _lock_for(self, token: str) -> threading.Lock:
+        """Get the lock serializing state transitions for a subscription.
+
+        Args:
+            token: Subscription token
+
+        Returns:
+            Lock shared by all engines currently working on this token
+        """
+        lock = _token_locks.get(token)
+        if lock is None:
+            with _token_locks_guard:
+                lock = _token_locks.get(token)
+                if lock is None:
+                    lock = threading.Lock()
+                    _token_locks[token] = lock
+        return lock
+
     def _get_time_controller(self):
         """lazy load time controller to avoid circular import"""
         if self._time_controller is None:
@@ -173,7 +206,7 @@ class SubscriptionEngine:
 
         # Determine start time
         if start_time_millis is None:
-            start_time_millis = int(time.time() * 1000)
+            start_time_millis = time.time_ns() // 1000000
 
         # Calculate expiry time
         trial_expiry_millis = None
@@ -254,53 +287,54 @@ class SubscriptionEngine:
             SubscriptionNotFoundError: If token not found
             InvalidSubscriptionStateError: If subscription cannot be canceled
         """
-        subscription = self.store.get_by_token(token)
-
-        # Validate state
-        if subscription.state not in (
-                SubscriptionState.ACTIVE,
-                SubscriptionState.PAUSED,
-                SubscriptionState.IN_GRACE_PERIOD,
-                SubscriptionState.ON_HOLD,
-        ):
-            raise InvalidSubscriptionStateError(
-                f"Cannot cancel subscription in {subscription.state.name} state"
+        with self._lock_for(token):
+            subscription = self.store.get_by_token(token)
+
+            # Validate state
+            if subscription.state not in (
+                    SubscriptionState.ACTIVE,
+                    SubscriptionState.PAUSED,
+                    SubscriptionState.IN_GRACE_PERIOD,
+                    SubscriptionState.ON_HOLD,
+            ):
+                raise InvalidSubscriptionStateError(
+                    f"Cannot cancel subscription in {subscription.state.name} state"
+                )
+
+            # Mark as canceled
+            canceled_time_millis = time.time_ns() // 1000000
+            subscription.canceled_time_millis = canceled_time_millis
+            subscription.cancel_reason = cancel_reason
+            subscription.set_auto_renewing(
+                False, reason=f"Canceled: {cancel_reason.name}"
             )
 
-        # Mark as canceled
-        canceled_time_millis = int(time.time() * 1000)
-        subscription.canceled_time_millis = canceled_time_millis
-        subscription.cancel_reason = cancel_reason
-        subscription.set_auto_renewing(
-            False, reason=f"Canceled: {cancel_reason.name}"
-        )
+            if immediate:
+                # Expire immediately
+                subscription.set_state(
+                    SubscriptionState.EXPIRED,
+                    reason=f"Immediate cancellation: {cancel_reason.name}",
+                )
+                subscription.expiry_time_millis = canceled_time_millis
+            else:
+                # Cancel at period end
+                subscription.set_state(
+                    SubscriptionState.CANCELED,
+                    reason=f"Canceled: {cancel_reason.name}",
+                )
+
+            # Update in store
+            self.store.update(subscription)
 
-        if immediate:
-            # Expire immediately
-            subscription.set_state(
-                SubscriptionState.EXPIRED,
-                reason=f"Immediate cancellation: {cancel_reason.name}",
-            )
-            subscription.expiry_time_millis = canceled_time_millis
-        else:
-            # Cancel at period end
-            subscription.set_state(
-                SubscriptionState.CANCELED,
-                reason=f"Canceled: {cancel_reason.name}",
+            logger.info(
+                "subscription_canceled",
+                token=token[:20] + "...",
+                subscription_id=subscription.subscription_id,
+                user_id=subscription.user_id,
+                cancel_reason=cancel_reason.name,
+                immediate=immediate,
+                expiry_millis=subscription.expiry_time_millis,
             )
-
-        # Update in store
-        self.store.update(subscription)
-
-        logger.info(
-            "subscription_canceled",
-            token=token[:20] + "...",
-            subscription_id=subscription.subscription_id,
-            user_id=subscription.user_id,
-            cancel_reason=cancel_reason.name,
-            immediate=immediate,
-            expiry_millis=subscription.expiry_time_millis,
-        )
         if immediate:
             # immediate cancellation = expired
             self._publish_event(NotificationType.SUBSCRIPTION_EXPIRED, subscription)
@@ -334,45 +368,46 @@ class SubscriptionEngine:
         if pause_duration_millis <= 0:
             raise ValueError("Pause duration must be positive")
 
-        subscription = self.store.get_by_token(token)
-
-        # Validate state - can only pause active subscriptions
-        if subscription.state != SubscriptionState.ACTIVE:
-            raise InvalidSubscriptionStateError(
-                f"Cannot pause subscription in {subscription.state.name} state. "
-                "Only ACTIVE subscriptions can be paused."
+        with self._lock_for(token):
+            subscription = self.store.get_by_token(token)
+
+            # Validate state - can only pause active subscriptions
+            if subscription.state != SubscriptionState.ACTIVE:
+                raise InvalidSubscriptionStateError(
+                    f"Cannot pause subscription in {subscription.state.name} state. "
+                    "Only ACTIVE subscriptions can be paused."
+                )
+
+            # Set pause times
+            current_time_millis = time.time_ns() // 1000000
+            subscription.pause_start_millis = current_time_millis
+            subscription.pause_end_millis = current_time_millis + pause_duration_millis
+
+            # Extend expiry by pause duration
+            old_expiry = subscription.expiry_time_millis
+            subscription.extend_expiry(
+                old_expiry + pause_duration_millis,
+                reason="Subscription paused",
             )
 
-        # Set pause times
-        current_time_millis = int(time.time() * 1000)
-        subscription.pause_start_millis = current_time_millis
-        subscription.pause_end_millis = current_time_millis + pause_duration_millis
-
-        # Extend expiry by pause duration
-        old_expiry = subscription.expiry_time_millis
-        subscription.extend_expiry(
-            old_expiry + pause_duration_millis,
-            reason="Subscription paused",
-        )
-
-        # Transition to paused state
-        subscription.set_state(
-            SubscriptionState.PAUSED,
-            reason="User paused subscription",
-        )
+            # Transition to paused state
+            subscription.set_state(
+                SubscriptionState.PAUSED,
+                reason="User paused subscription",
+            )
 
-        # Update in store
-        self.store.update(subscription)
+            # Update in store
+            self.store.update(subscription)
 
-        logger.info(
-            "subscription_paused",
-            token=token[:20] + "...",
-            subscription_id=subscription.subscription_id,
-            user_id=subscription.user_id,
-            pause_start=subscription.pause_start_millis,
-            pause_end=subscription.pause_end_millis,
-            new_expiry=subscription.expiry_time_millis,
-        )
+            logger.info(
+                "subscription_paused",
+                token=token[:20] + "...",
+                subscription_id=subscription.subscription_id,
+                user_id=subscription.user_id,
+                pause_start=subscription.pause_start_millis,
+                pause_end=subscription.pause_end_millis,
+                new_expiry=subscription.expiry_time_millis,
+            )
 
         self._publish_event(NotificationType.SUBSCRIPTION_PAUSED, subscription)
 
@@ -393,53 +428,54 @@ class SubscriptionEngine:
             SubscriptionNotFoundError: If token not found
             InvalidSubscriptionStateError: If subscription is not paused
         """
-        subscription = self.store.get_by_token(token)
-
-        # Validate state
-        if subscription.state != SubscriptionState.PAUSED:
-            raise InvalidSubscriptionStateError(
-                f"Cannot resume subscription in {subscription.state.name} state. "
-                "Only PAUSED subscriptions can be resumed."
+        with self._lock_for(token):
+            subscription = self.store.get_by_token(token)
+
+            # Validate state
+            if subscription.state != SubscriptionState.PAUSED:
+                raise InvalidSubscriptionStateError(
+                    f"Cannot resume subscription in {subscription.state.name} state. "
+                    "Only PAUSED subscriptions can be resumed."
+                )
+
+            # Calculate how much pause time was actually used
+            current_time_millis = time.time_ns() // 1000000
+            if subscription.pause_start_millis:
+                actual_pause_duration = (
+                        current_time_millis - subscription.pause_start_millis
+                )
+                logger.debug(
+                    "pause_duration_calculated",
+                    token=token[:20] + "...",
+                    actual_pause_millis=actual_pause_duration,
+                    scheduled_pause_millis=(
+                        subscription.pause_end_millis - subscription.pause_start_millis
+                        if subscription.pause_end_millis
+                        else 0
+                    ),
+                )
+
+            # Clear pause times
+            subscription.pause_start_millis = None
+            subscription.pause_end_millis = None
+
+            # Transition to active state
+            subscription.set_state(
+                SubscriptionState.ACTIVE,
+                reason="User resumed subscription",
             )
 
-        # Calculate how much pause time was actually used
-        current_time_millis = int(time.time() * 1000)
-        if subscription.pause_start_millis:
-            actual_pause_duration = (
-                    current_time_millis - subscription.pause_start_millis
-            )
-            logger.debug(
-                "pause_duration_calculated",
+            # Update in store
+            self.store.update(subscription)
+
+            logger.info(
+                "subscription_resumed",
                 token=token[:20] + "...",
-                actual_pause_millis=actual_pause_duration,
-                scheduled_pause_millis=(
-                    subscription.pause_end_millis - subscription.pause_start_millis
-                    if subscription.pause_end_millis
-                    else 0
-                ),
+                subscription_id=subscription.subscription_id,
+                user_id=subscription.user_id,
+                expiry_millis=subscription.expiry_time_millis,
             )
 
-        # Clear pause times
-        subscription.pause_start_millis = None
-        subscription.pause_end_millis = None
-
-        # Transition to active state
-        subscription.set_state(
-            SubscriptionState.ACTIVE,
-            reason="User resumed subscription",
-        )
-
-        # Update in store
-        self.store.update(subscription)
-
-        logger.info(
-            "subscription_resumed",
-            token=token[:20] + "...",
-            subscription_id=subscription.subscription_id,
-            user_id=subscription.user_id,
-            expiry_millis=subscription.expiry_time_millis,
-        )
-
         self._publish_event(NotificationType.SUBSCRIPTION_RESTARTED, subscription)
 
         return subscription
@@ -470,14 +506,7 @@ class SubscriptionEngine:
         Returns:
             List of SubscriptionRecord objects
         """
-        subscriptions = self.store.get_by_user(user_id)
-
-        if package_name:
-            subscriptions = [
-                s for s in subscriptions if s.package_name == package_name
-            ]
-
-        return subscriptions
+        return self.store.get_by_user(user_id, package_name=package_name or None)
 
     def has_active_subscription(
             self,
@@ -536,76 +565,79 @@ class SubscriptionEngine:
             InvalidSubscriptionStateError: If subscription cannot be renewed
             SubscriptionError: If renewal would be invalid
         """
-        subscription = self.store.get_by_token(token)
-
-        # Validate state - can only renew active or canceled subscriptions
-        if subscription.state not in (
-                SubscriptionState.ACTIVE,
-                SubscriptionState.CANCELED,
-        ):
-            raise InvalidSubscriptionStateError(
-                f"Cannot renew subscription in {subscription.state.name} state. "
-                "Only ACTIVE or CANCELED subscriptions can be renewed."
-            )
+        with self._lock_for(token):
+            subscription = self.store.get_by_token(token)
 
-        # Cannot renew if auto-renewing is disabled (unless canceled, which will be reactivated)
-        if not subscription.auto_renewing and subscription.state != SubscriptionState.CANCELED:
-            raise SubscriptionError(
-                "Cannot renew subscription with auto_renewing=False. "
-                "Enable auto-renewal first."
-            )
+            # Validate state - can only renew active or canceled subscriptions
+            if subscription.state not in (
+                    SubscriptionState.ACTIVE,
+                    SubscriptionState.CANCELED,
+            ):
+                raise InvalidSubscriptionStateError(
+                    f"Cannot renew subscription in {subscription.state.name} state. "
+                    "Only ACTIVE or CANCELED subscriptions can be renewed."
+                )
+
+            # Cannot renew if auto-renewing is disabled (unless canceled, which will be reactivated)
+            if not subscription.auto_renewing and subscription.state != SubscriptionState.CANCELED:
+                raise SubscriptionError(
+                    "Cannot renew subscription with auto_renewing=False. "
+                    "Enable auto-renewal first."
+                )
+
+            # Get product definition for billing period
+            product = self.product_repo.get_by_id(subscription.subscription_id)
+
+            # Determine renewal time (defaults to current expiry)
+            if renewal_time_millis is None:
+                renewal_time_millis = subscription.expiry_time_millis
+
+            # Apply the renewal as one transition so it is logged as a single entry
+            with subscription.transaction(reason="renewal"):
+                # Handle trial-to-paid transition
+                if subscription.in_trial:
+                    # Transitioning from trial to paid
+                    subscription.in_trial = False
+                    subscription.set_payment_state(
+                        PaymentState.PAYMENT_RECEIVED,
+                        reason="Trial ended, first paid renewal",
+                    )
 
-        # Get product definition for billing period
-        product = self.product_repo.get_by_id(subscription.subscription_id)
+                # Calculate new expiry
+                billing_period_millis = parse_billing_period(product.billing_period)
+                new_expiry_millis = renewal_time_millis + billing_period_millis
 
-        # Determine renewal time (defaults to current expiry)
-        if renewal_time_millis is None:
-            renewal_time_millis = subscription.expiry_time_millis
+                # Extend expiry
+                subscription.extend_expiry(
+                    new_expiry_millis,
+                    reason=f"Renewal #{subscription.renewal_count + 1}",
+                )
 
-        # Handle trial-to-paid transition
-        if subscription.in_trial:
-            # Transitioning from trial to paid
-            subscription.in_trial = False
-            subscription.set_payment_state(
-                PaymentState.PAYMENT_RECEIVED,
-                reason="Trial ended, first paid renewal",
-            )
-
-        # Calculate new expiry
-        billing_period_millis = parse_billing_period(product.billing_period)
-        new_expiry_millis = renewal_time_millis + billing_period_millis
+                # Increment renewal count
+                subscription.renewal_count += 1
 
-        # Extend expiry
-        subscription.extend_expiry(
-            new_expiry_millis,
-            reason=f"Renewal #{subscription.renewal_count + 1}",
-        )
+                # If subscription was canceled, reactivate it
+                if subscription.state == SubscriptionState.CANCELED:
+                    subscription.set_state(
+                        SubscriptionState.ACTIVE,
+                        reason="Subscription renewed after cancellation",
+                    )
+                    subscription.set_auto_renewing(True, reason="Renewed subscription")
+                    subscription.cancel_reason = None
+                    subscription.canceled_time_millis = None
 
-        # Increment renewal count
-        subscription.renewal_count += 1
+            # Update in store
+            self.store.update(subscription)
 
-        # If subscription was canceled, reactivate it
-        if subscription.state == SubscriptionState.CANCELED:
-            subscription.set_state(
-                SubscriptionState.ACTIVE,
-                reason="Subscription renewed after cancellation",
+            logger.info(
+                "subscription_renewed",
+                token=token[:20] + "...",
+                subscription_id=subscription.subscription_id,
+                user_id=subscription.user_id,
+                renewal_count=subscription.renewal_count,
+                new_expiry=new_expiry_millis,
+                from_trial=subscription.in_trial,
             )
-            subscription.set_auto_renewing(True, reason="Renewed subscription")
-            subscription.cancel_reason = None
-            subscription.canceled_time_millis = None
-
-        # Update in store
-        self.store.update(subscription)
-
-        logger.info(
-            "subscription_renewed",
-            token=token[:20] + "...",
-            subscription_id=subscription.subscription_id,
-            user_id=subscription.user_id,
-            renewal_count=subscription.renewal_count,
-            new_expiry=new_expiry_millis,
-            from_trial=subscription.in_trial,
-        )
 
         self._publish_event(NotificationType.SUBSCRIPTION_RENEWED, subscription)
 
@@ -633,55 +665,56 @@ class SubscriptionEngine:
             SubscriptionNotFoundError: If token not found
             InvalidSubscriptionStateError: If subscription cannot have payment failure
         """
-        subscription = self.store.get_by_token(token)
-
-        # Can only fail payment on active subscriptions
-        if subscription.state != SubscriptionState.ACTIVE:
-            raise InvalidSubscriptionStateError(
-                f"Cannot simulate payment failure on {subscription.state.name} subscription. "
-                "Only ACTIVE subscriptions can have payment failures."
+        with self._lock_for(token):
+            subscription = self.store.get_by_token(token)
+
+            # Can only fail payment on active subscriptions
+            if subscription.state != SubscriptionState.ACTIVE:
+                raise InvalidSubscriptionStateError(
+                    f"Cannot simulate payment failure on {subscription.state.name} subscription. "
+                    "Only ACTIVE subscriptions can have payment failures."
+                )
+
+            # Get product definition for grace period
+            product = self.product_repo.get_by_id(subscription.subscription_id)
+
+            if not product.grace_period:
+                raise SubscriptionError(
+                    f"Product {subscription.subscription_id} has no grace_period configured"
+                )
+
+            # Determine failure time
+            if failure_time_millis is None:
+                failure_time_millis = time.time_ns() // 1000000
+
+            # Calculate grace period end
+            grace_period_millis = parse_billing_period(product.grace_period)
+            grace_period_end_millis = failure_time_millis + grace_period_millis
+            subscription.grace_period_end_millis = grace_period_end_millis
+
+            # Update payment state
+            subscription.set_payment_state(
+                PaymentState.PAYMENT_FAILED,
+                reason="Payment failed at renewal",
             )
 
-        # Get product definition for grace period
-        product = self.product_repo.get_by_id(subscription.subscription_id)
-
-        if not product.grace_period:
-            raise SubscriptionError(
-                f"Product {subscription.subscription_id} has no grace_period configured"
+            # Transition to grace period
+            subscription.set_state(
+                SubscriptionState.IN_GRACE_PERIOD,
+                reason="Payment failed, entered grace period",
             )
 
-        # Determine failure time
-        if failure_time_millis is None:
-            failure_time_millis = int(time.time() * 1000)
-
-        # Calculate grace period end
-        grace_period_millis = parse_billing_period(product.grace_period)
-        grace_period_end_millis = failure_time_millis + grace_period_millis
-        subscription.grace_period_end_millis = grace_period_end_millis
-
-        # Update payment state
-        subscription.set_payment_state(
-            PaymentState.PAYMENT_FAILED,
-            reason="Payment failed at renewal",
-        )
+            # Update in store
+            self.store.update(subscription)
 
-        # Transition to grace period
-        subscription.set_state(
-            SubscriptionState.IN_GRACE_PERIOD,
-            reason="Payment failed, entered grace period",
-        )
-
-        # Update in store
-        self.store.update(subscription)
-
-        logger.info(
-            "subscription_payment_failed",
-            token=token[:20] + "...",
-            subscription_id=subscription.subscription_id,
-            user_id=subscription.user_id,
-            grace_period_end=grace_period_end_millis,
-            expiry_millis=subscription.expiry_time_millis,
-        )
+            logger.info(
+                "subscription_payment_failed",
+                token=token[:20] + "...",
+                subscription_id=subscription.subscription_id,
+                user_id=subscription.user_id,
+                grace_period_end=grace_period_end_millis,
+                expiry_millis=subscription.expiry_time_millis,
+            )
 
         self._publish_event(NotificationType.SUBSCRIPTION_IN_GRACE_PERIOD, subscription)
 
@@ -707,19 +740,39 @@ class SubscriptionEngine:
             SubscriptionNotFoundError: If token not found
             InvalidSubscriptionStateError: If subscription is not in grace period
         """
-        subscription = self.store.get_by_token(token)
+        with self._lock_for(token):
+            subscription = self.store.get_by_token(token)
 
-        # Must be in grace period
-        if subscription.state != SubscriptionState.IN_GRACE_PERIOD:
-            raise InvalidSubscriptionStateError(
-                f"Cannot transition to account hold from {subscription.state.name}. "
-                "Must be IN_GRACE_PERIOD."
-            )
+            # Must be in grace period
+            if subscription.state != SubscriptionState.IN_GRACE_PERIOD:
+                raise InvalidSubscriptionStateError(
+                    f"Cannot transition to account hold from {subscription.state.name}. "
+                    "Must be IN_GRACE_PERIOD."
+                )
+
+            # Determine hold start time
+            if hold_time_millis is None:
+                hold_time_millis = time.time_ns() // 1000000
+
+            self._place_on_hold(subscription, hold_time_millis)
+
+            # Update in store
+            self.store.update(subscription)
 
-        # Determine hold start time
-        if hold_time_millis is None:
-            hold_time_millis = int(time.time() * 1000)
+        self._publish_event(NotificationType.SUBSCRIPTION_ON_HOLD, subscription)
+
+        return subscription
+
+    def _place_on_hold(self, subscription: SubscriptionRecord, hold_time_millis: int) -> None:
+        """Move a grace period subscription to account hold, without storing it.
 
+        The caller must hold the subscription's token lock and have checked
+        that it is IN_GRACE_PERIOD.
+
+        Args:
+            subscription: Subscription record to update in place
+            hold_time_millis: Time of account hold start
+        """
         # Set account hold start time
         subscription.account_hold_start_millis = hold_time_millis
 
@@ -732,22 +785,15 @@ class SubscriptionEngine:
             reason="Grace period expired without payment",
         )
 
-        # Update in store
-        self.store.update(subscription)
-
         logger.info(
             "subscription_on_hold",
-            token=token[:20] + "...",
+            token=subscription.token[:20] + "...",
             subscription_id=subscription.subscription_id,
             user_id=subscription.user_id,
             hold_start=hold_time_millis,
             expiry_millis=subscription.expiry_time_millis,
         )
 
-        self._publish_event(NotificationType.SUBSCRIPTION_ON_HOLD, subscription)
-
-        return subscription
-
     def recover_from_payment_failure(
             self,
             token: str,
@@ -769,51 +815,52 @@ class SubscriptionEngine:
             SubscriptionNotFoundError: If token not found
             InvalidSubscriptionStateError: If subscription is not in recoverable state
         """
-        subscription = self.store.get_by_token(token)
+        with self._lock_for(token):
+            subscription = self.store.get_by_token(token)
 
-        # Can only recover from grace period or account hold
-        if subscription.state not in (
-                SubscriptionState.IN_GRACE_PERIOD,
-                SubscriptionState.ON_HOLD,
-        ):
-            raise InvalidSubscriptionStateError(
-                f"Cannot recover from {subscription.state.name}. "
-                "Must be IN_GRACE_PERIOD or ON_HOLD."
-            )
+            # Can only recover from grace period or account hold
+            if subscription.state not in (
+                    SubscriptionState.IN_GRACE_PERIOD,
+                    SubscriptionState.ON_HOLD,
+            ):
+                raise InvalidSubscriptionStateError(
+                    f"Cannot recover from {subscription.state.name}. "
+                    "Must be IN_GRACE_PERIOD or ON_HOLD."
+                )
 
-        # Determine recovery time
-        if recovery_time_millis is None:
-            recovery_time_millis = int(time.time() * 1000)
+            # Determine recovery time
+            if recovery_time_millis is None:
+                recovery_time_millis = time.time_ns() // 1000000
 
-        # Update payment state to received
-        subscription.set_payment_state(
-            PaymentState.PAYMENT_RECEIVED,
-            reason="Payment recovered",
-        )
+            # Update payment state to received
+            subscription.set_payment_state(
+                PaymentState.PAYMENT_RECEIVED,
+                reason="Payment recovered",
+            )
 
-        # Clear grace period and hold markers
-        subscription.grace_period_end_millis = None
-        subscription.account_hold_start_millis = None
+            # Clear grace period and hold markers
+            subscription.grace_period_end_millis = None
+            subscription.account_hold_start_millis = None
 
-        # Transition to active
-        old_state = subscription.state
-        subscription.set_state(
-            SubscriptionState.ACTIVE,
-            reason=f"Recovered from {old_state.name}",
-        )
+            # Transition to active
+            old_state = subscription.state
+            subscription.set_state(
+                SubscriptionState.ACTIVE,
+                reason=f"Recovered from {old_state.name}",
+            )
 
-        # Update in store
-        self.store.update(subscription)
+            # Update in store
+            self.store.update(subscription)
 
-        logger.info(
-            "subscription_recovered",
-            token=token[:20] + "...",
-            subscription_id=subscription.subscription_id,
-            user_id=subscription.user_id,
-            recovered_from=old_state.name,
-            recovery_time=recovery_time_millis,
-            expiry_millis=subscription.expiry_time_millis,
-        )
+            logger.info(
+                "subscription_recovered",
+                token=token[:20] + "...",
+                subscription_id=subscription.subscription_id,
+                user_id=subscription.user_id,
+                recovered_from=old_state.name,
+                recovery_time=recovery_time_millis,
+                expiry_millis=subscription.expiry_time_millis,
+            )
 
         self._publish_event(NotificationType.SUBSCRIPTION_RECOVERED, subscription)
 
@@ -835,19 +882,32 @@ class SubscriptionEngine:
             List of subscriptions transitioned to account hold
         """
         grace_period_subs = self.store.get_in_grace_period()
+        due = [
+            subscription
+            for subscription in grace_period_subs
+            if subscription.grace_period_end_millis
+            and current_time_millis >= subscription.grace_period_end_millis
+        ]
         transitioned = []
 
-        for subscription in grace_period_subs:
-            if (
-                    subscription.grace_period_end_millis
-                    and current_time_millis >= subscription.grace_period_end_millis
-            ):
+        # The records from the state query are updated in place rather than
+        # fetched again by token. Every token lock is held until the store
+        # write, taken in token order so concurrent sweeps cannot deadlock.
+        with ExitStack() as locks:
+            for token in sorted({subscription.token for subscription in due}):
+                locks.enter_context(self._lock_for(token))
+
+            for subscription in due:
                 try:
-                    updated = self.transition_to_account_hold(
-                        subscription.token,
-                        hold_time_millis=current_time_millis,
-                    )
-                    transitioned.append(updated)
+                    # Checked under the lock, as another call may have moved it on
+                    if (
+                            subscription.state != SubscriptionState.IN_GRACE_PERIOD
+                            or not subscription.grace_period_end_millis
+                            or current_time_millis < subscription.grace_period_end_millis
+                    ):
+                        continue
+                    self._place_on_hold(subscription, current_time_millis)
+                    transitioned.append(subscription)
                 except Exception as e:
                     logger.error(
                         "grace_period_expiration_failed",
@@ -855,6 +915,28 @@ class SubscriptionEngine:
                         error=str(e),
                     )
 
+            if transitioned:
+                try:
+                    self.store.update_many(transitioned)
+                except SubscriptionNotFoundError:
+                    # A subscription was removed during the sweep, so store the rest one by one
+                    saved = []
+                    for subscription in transitioned:
+                        try:
+                            self.store.update(subscription)
+                            saved.append(subscription)
+                        except SubscriptionNotFoundError as e:
+                            logger.error(
+                                "grace_period_expiration_failed",
+                                token=subscription.token[:20] + "...",
+                                error=str(e),
+                            )
+                    transitioned = saved
+
+        # Published only for records the store accepted, after the locks are released
+        for subscription in transitioned:
+            self._publish_event(NotificationType.SUBSCRIPTION_ON_HOLD, subscription)
+
         if transitioned:
             logger.info(
                 "grace_periods_processed",
@@ -878,30 +960,31 @@ class SubscriptionEngine:
             SubscriptionNotFoundError: If subscription not found
             ValueError: If new expiry is before current expiry
         """
-        subscription = self.store.get_by_token(token)
+        with self._lock_for(token):
+            subscription = self.store.get_by_token(token)
 
-        # Validate new expiry is in the future
-        if new_expiry_millis <= subscription.expiry_time_millis:
-            raise ValueError(
-                f"New expiry time ({new_expiry_millis}) must be after "
-                f"current expiry ({subscription.expiry_time_millis})"
-            )
+            # Validate new expiry is in the future
+            if new_expiry_millis <= subscription.expiry_time_millis:
+                raise ValueError(
+                    f"New expiry time ({new_expiry_millis}) must be after "
+                    f"current expiry ({subscription.expiry_time_millis})"
+                )
 
-        # Update expiry time
-        old_expiry = subscription.expiry_time_millis
-        subscription.expiry_time_millis = new_expiry_millis
+            # Update expiry time
+            old_expiry = subscription.expiry_time_millis
+            subscription.expiry_time_millis = new_expiry_millis
 
-        # Update in store
-        self.store.update(subscription)
+            # Update in store
+            self.store.update(subscription)
 
-        logger.info(
-            "subscription_deferred",
-            token=token[:20] + "...",
-            subscription_id=subscription.subscription_id,
-            old_expiry_millis=old_expiry,
-            new_expiry_millis=new_expiry_millis,
-            deferred_by_millis=new_expiry_millis - old_expiry,
-        )
+            logger.info(
+                "subscription_deferred",
+                token=token[:20] + "...",
+                subscription_id=subscription.subscription_id,
+                old_expiry_millis=old_expiry,
+                new_expiry_millis=new_expiry_millis,
+                deferred_by_millis=new_expiry_millis - old_expiry,
+            )
 
         self._publish_event(NotificationType.SUBSCRIPTION_DEFERRED, subscription)
 
@@ -929,40 +1012,41 @@ class SubscriptionEngine:
             SubscriptionNotFoundError: If token not found
             InvalidSubscriptionStateError: If subscription cannot be revoked
         """
-        subscription = self.store.get_by_token(token)
+        with self._lock_for(token):
+            subscription = self.store.get_by_token(token)
 
-        # Can only revoke non-expired subscriptions
-        if subscription.state == SubscriptionState.EXPIRED:
-            raise InvalidSubscriptionStateError(
-                "Cannot revoke an already expired subscription"
-            )
+            # Can only revoke non-expired subscriptions
+            if subscription.state == SubscriptionState.EXPIRED:
+                raise InvalidSubscriptionStateError(
+                    "Cannot revoke an already expired subscription"
+                )
 
-        # Determine revoke time
-        if revoke_time_millis is None:
-            revoke_time_millis = int(time.time() * 1000)
+            # Determine revoke time
+            if revoke_time_millis is None:
+                revoke_time_millis = time.time_ns() // 1000000
 
-        # Mark as revoked (use canceled fields for tracking)
-        subscription.canceled_time_millis = revoke_time_millis
-        subscription.cancel_reason = CancelReason.SYSTEM_CANCELED
-        subscription.set_auto_renewing(False, reason="Subscription revoked")
+            # Mark as revoked (use canceled fields for tracking)
+            subscription.canceled_time_millis = revoke_time_millis
+            subscription.cancel_reason = CancelReason.SYSTEM_CANCELED
+            subscription.set_auto_renewing(False, reason="Subscription revoked")
 
-        # Expire immediately
-        subscription.set_state(
-            SubscriptionState.EXPIRED,
-            reason="Subscription revoked",
-        )
-        subscription.expiry_time_millis = revoke_time_millis
+            # Expire immediately
+            subscription.set_state(
+                SubscriptionState.EXPIRED,
+                reason="Subscription revoked",
+            )
+            subscription.expiry_time_millis = revoke_time_millis
 
-        # Update in store
-        self.store.update(subscription)
+            # Update in store
+            self.store.update(subscription)
 
-        logger.info(
-            "subscription_revoked",
-            token=token[:20] + "...",
-            subscription_id=subscription.subscription_id,
-            user_id=subscription.user_id,
-            revoke_time=revoke_time_millis,
-        )
+            logger.info(
+                "subscription_revoked",
+                token=token[:20] + "...",
+                subscription_id=subscription.subscription_id,
+                user_id=subscription.user_id,
+                revoke_time=revoke_time_millis,
+            )
 
         # Publish SUBSCRIPTION_REVOKED event
         self._publish_event(NotificationType.SUBSCRIPTION_REVOKED, subscription)
@@ -983,17 +1067,18 @@ class SubscriptionEngine:
         Raises:
             SubscriptionNotFoundError: If token not found
         """
-        subscription = self.store.get_by_token(token)
+        with self._lock_for(token):
+            subscription = self.store.get_by_token(token)
 
-        subscription.acknowledge()
-        self.store.update(subscription)
+            subscription.acknowledge()
+            self.store.update(subscription)
 
-        logger.info(
-            "subscription_acknowledged",
-            token=token[:20] + "...",
-            subscription_id=subscription.subscription_id,
-            user_id=subscription.user_id,
-        )
+            logger.info(
+                "subscription_acknowledged",
+                token=token[:20] + "...",
+                subscription_id=subscription.subscription_id,
+                user_id=subscription.user_id,
+            )
 
         return subscription
 
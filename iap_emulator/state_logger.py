@@ -3,7 +3,7 @@
 Tracks state transitions with before/after values for debugging and auditing.
 """
 
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 
 from iap_emulator.logging_config import get_logger
 
@@ -182,3 +182,29 @@ def log_expiry_change(
         reason=reason,
         **extra_context,
     )
+
+
+def log_subscription_transition(
+    token: str,
+    subscription_id: str,
+    changes: List[Dict[str, Any]],
+    reason: Optional[str] = None,
+    **extra_context: Any,
+) -> None:
+    """Log several subscription changes made as one transition.
+
+    Args:
+        token: Subscription token
+        subscription_id: Subscription product ID
+        changes: Ordered change entries, each with seq, field, old, new and reason
+        reason: Reason for the transition as a whole
+        **extra_context: Additional context
+    """
+    logger.info(
+        "subscription_transition",
+        token=token[:20] + "..." if len(token) > 20 else token,
+        subscription_id=subscription_id,
+        changes=changes,
+        reason=reason,
+        **extra_context,
+    )
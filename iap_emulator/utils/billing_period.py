@@ -6,6 +6,7 @@ and converts them to milliseconds for time calculations.
 
 import re
 from datetime import timedelta
+from functools import lru_cache
 
 # Milliseconds in common time units
 MILLIS_PER_SECOND = 1000
@@ -16,7 +17,11 @@ MILLIS_PER_WEEK = 7 * MILLIS_PER_DAY
 MILLIS_PER_MONTH = 30 * MILLIS_PER_DAY  # Standard approximation for billing
 MILLIS_PER_YEAR = 365 * MILLIS_PER_DAY  # Standard approximation for billing
 
+# Simple periods: P[n]D, P[n]W, P[n]M, P[n]Y, where [n] is an optional number (defaults to 1)
+_PERIOD_PATTERN = re.compile(r"^(\d+)?([DWMY])$")
 
+
+@lru_cache(maxsize=256)
 def parse_billing_period(period: str) -> int:
     """Parse ISO 8601 duration string to milliseconds.
 
@@ -29,6 +34,9 @@ def parse_billing_period(period: str) -> int:
     Note: Months are approximated as 30 days and years as 365 days,
     consistent with Google Play billing calculations.
 
+    Products use a handful of distinct periods, so results are cached per
+    period string.
+
     Args:
         period: ISO 8601 duration string (e.g., "P1M", "P1Y", "P7D")
 
@@ -65,10 +73,7 @@ def parse_billing_period(period: str) -> int:
     if not duration_str:
         raise ValueError(f"Invalid period format: '{period}'. No duration specified")
 
-    # Pattern for simple periods: P[n]D, P[n]W, P[n]M, P[n]Y
-    # where [n] is an optional number (defaults to 1)
-    pattern = r'^(\d+)?([DWMY])$'
-    match = re.match(pattern, duration_str)
+    match = _PERIOD_PATTERN.match(duration_str)
 
     if not match:
         raise ValueError(
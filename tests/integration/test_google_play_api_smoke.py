@@ -374,3 +374,59 @@ def test_refund_order_with_revoke_parameter(client, subscription_engine):
     # Verify subscription was revoked
     updated_subscription = subscription_engine.get_subscription(subscription.token)
     assert updated_subscription.state == SubscriptionState.EXPIRED
+
+
+def test_defer_subscription_missing_deferral_info(client, subscription_engine):
+    """Test deferring a subscription with a body missing deferralInfo."""
+    subscription = subscription_engine.create_subscription(
+        subscription_id="premium.personal.yearly",
+        package_name="com.example.secureapp",
+        user_id="test-user-defer-invalid",
+    )
+
+    response = client.post(
+        "/androidpublisher/v3/applications/com.example.secureapp/purchases/subscriptions/"
+        f"premium.personal.yearly/tokens/{subscription.token}:defer",
+        json={},
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "deferralInfo"]
+
+
+def test_defer_subscription_parses_millis_string(client, subscription_engine):
+    """Test deferring a subscription with expiry millis sent as a string."""
+    subscription = subscription_engine.create_subscription(
+        subscription_id="premium.personal.yearly",
+        package_name="com.example.secureapp",
+        user_id="test-user-defer",
+    )
+    new_expiry_millis = subscription.expiry_time_millis + 7 * 24 * 60 * 60 * 1000
+
+    response = client.post(
+        "/androidpublisher/v3/applications/com.example.secureapp/purchases/subscriptions/"
+        f"premium.personal.yearly/tokens/{subscription.token}:defer",
+        json={"deferralInfo": {"expectedExpiryTimeMillis": str(new_expiry_millis)}},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["expiryTimeMillis"] == str(new_expiry_millis)
+    assert subscription_engine.get_subscription(subscription.token).expiry_time_millis == new_expiry_millis
+
+
+def test_defer_subscription_invalid_millis(client, subscription_engine):
+    """Test deferring a subscription with non-numeric expiry millis."""
+    subscription = subscription_engine.create_subscription(
+        subscription_id="premium.personal.yearly",
+        package_name="com.example.secureapp",
+        user_id="test-user-defer-format",
+    )
+
+    response = client.post(
+        "/androidpublisher/v3/applications/com.example.secureapp/purchases/subscriptions/"
+        f"premium.personal.yearly/tokens/{subscription.token}:defer",
+        json={"deferralInfo": {"expectedExpiryTimeMillis": "tomorrow"}},
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "deferralInfo", "expectedExpiryTimeMillis"]
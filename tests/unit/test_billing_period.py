@@ -99,6 +99,19 @@ class TestParseBillingPeriod:
         assert parse_billing_period("P365D") == 365 * MILLIS_PER_DAY
         assert parse_billing_period("P100M") == 100 * MILLIS_PER_MONTH
 
+    def test_parse_results_are_cached(self):
+        """Test that repeated periods are served from the cache."""
+        parse_billing_period.cache_clear()
+        parse_billing_period("P1Y")
+        parse_billing_period("P1Y")
+        assert parse_billing_period.cache_info().hits == 1
+
+    def test_parse_invalid_period_is_not_cached(self):
+        """Test that invalid periods raise every time."""
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                parse_billing_period("P1X")
+
 
 class TestBillingPeriodToTimedelta:
     """Test billing_period_to_timedelta function."""
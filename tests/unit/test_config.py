@@ -1,6 +1,7 @@
 """Tests for configuration loading and management."""
 
 import pytest
+from pydantic import ValidationError
 
 from iap_emulator.config import Config, get_config
 
@@ -120,6 +121,13 @@ class TestEmulatorConfiguration:
         assert isinstance(config.emulator_settings.token_length, int)
         assert config.emulator_settings.token_length > 0
 
+    def test_emulator_settings_are_immutable(self, config):
+        """Test that loaded emulator settings cannot be modified."""
+        with pytest.raises(ValidationError):
+            config.emulator_settings.rtdn_enabled = False
+        with pytest.raises(ValidationError):
+            config.products.pubsub.topic = "other-topic"
+
 
 class TestPackageConfiguration:
     """Test package configuration access."""
@@ -211,6 +219,27 @@ class TestConfigReload:
         """Test that calling reload doesn't raise an error."""
         config.reload()  # Should not raise
 
+    def test_reload_unchanged_file_keeps_products(self, config):
+        """Test that reloading an unchanged file reuses the validated config."""
+        products = config.products
+        config.reload()
+        assert config.products is products
+
+    def test_reload_picks_up_changes(self, tmp_path):
+        """Test that reloading a modified file loads the new content."""
+        config_file = tmp_path / "products.yaml"
+        original = Config().config_path.read_text(encoding="utf-8")
+        config_file.write_text(original, encoding="utf-8")
+        config = Config(str(config_file))
+
+        config_file.write_text(
+            original.replace("com.example.secureapp", "com.example.changed"),
+            encoding="utf-8",
+        )
+        config.reload()
+
+        assert config.default_package_name == "com.example.changed"
+
 
 class TestGetConfigSingleton:
     """Test get_config singleton pattern."""
@@ -16,7 +16,7 @@ class TestEventDispatcherInitialization:
         """Reset singleton before each test."""
         reset_event_dispatcher()
 
-    @patch('iap_emulator.services.event_dispatcher.pubsub_v1.PublisherClient')
+    @patch('google.cloud.pubsub_v1.PublisherClient')
     def test_dispatcher_initializes_when_enabled(self, mock_publisher_class):
         """Test dispatcher initializes when RTDN is enabled in config."""
         mock_publisher = Mock()
@@ -43,7 +43,7 @@ class TestEventPublishing:
         """Reset singleton before each test."""
         reset_event_dispatcher()
 
-    @patch('iap_emulator.services.event_dispatcher.pubsub_v1.PublisherClient')
+    @patch('google.cloud.pubsub_v1.PublisherClient')
     def test_publish_subscription_event_success(self, mock_publisher_class):
         """successful subscription event publishing"""
         mock_publisher = Mock()
@@ -66,7 +66,7 @@ class TestEventPublishing:
         assert result is True
         mock_publisher.publish.assert_called_once()
 
-    @patch('iap_emulator.services.event_dispatcher.pubsub_v1.PublisherClient')
+    @patch('google.cloud.pubsub_v1.PublisherClient')
     def test_publish_product_event_success(self, mock_publisher_class):
         """Test successful product event publishing."""
         # Setup mock
@@ -90,7 +90,7 @@ class TestEventPublishing:
         assert result is True
         mock_publisher.publish.assert_called_once()
 
-    @patch('iap_emulator.services.event_dispatcher.pubsub_v1.PublisherClient')
+    @patch('google.cloud.pubsub_v1.PublisherClient')
     def test_publish_event_when_disabled(self, mock_publisher_class):
         """Test publishing when dispatcher is disabled returns False."""
         mock_publisher = Mock()
@@ -110,11 +110,34 @@ class TestEventPublishing:
         assert result is False
         mock_publisher.publish.assert_not_called()
 
-    @patch('iap_emulator.services.event_dispatcher.pubsub_v1.PublisherClient')
+    @patch('google.cloud.pubsub_v1.PublisherClient')
     def test_publish_event_handles_exceptions(self, mock_publisher_class):
         """Test that publishing handles exceptions gracefully."""
         # Setup mock to raise exception
         mock_publisher = Mock()
+        mock_publisher.publish.side_effect = Exception("Pub/Sub error")
+        mock_publisher.topic_path.return_value = "projects/emulator-project/topics/iap_rtdn"
+        mock_publisher_class.return_value = mock_publisher
+
+        dispatcher = EventDispatcher()
+
+        # Should return False but not raise exception
+        result = dispatcher.publish_subscription_event(
+            notification_type=NotificationType.SUBSCRIPTION_CANCELED,
+            purchase_token="test_token",
+            subscription_id="premium.yearly",
+            package_name="com.example.app",
+        )
+
+        assert result is False
+
+    @patch('google.cloud.pubsub_v1.SubscriberClient')
+    @patch('google.cloud.pubsub_v1.PublisherClient')
+    def test_publish_does_not_wait_for_confirmation(
+        self, mock_publisher_class, mock_subscriber_class
+    ):
+        """Test that publishing returns without blocking on the future."""
+        mock_publisher = Mock()
         mock_future = Mock()
         mock_future.result.side_effect = Exception("Pub/Sub error")
         mock_publisher.publish.return_value = mock_future
@@ -123,7 +146,6 @@ class TestEventPublishing:
 
         dispatcher = EventDispatcher()
 
-        # Should return False but not raise exception
         result = dispatcher.publish_subscription_event(
             notification_type=NotificationType.SUBSCRIPTION_CANCELED,
             purchase_token="test_token",
@@ -131,7 +153,14 @@ class TestEventPublishing:
             package_name="com.example.app",
         )
 
-        assert result is False
+        assert result is True
+        mock_future.result.assert_not_called()
+        assert dispatcher._pending == {mock_future}
+
+        # Failed confirmations are logged and no longer tracked
+        callback = mock_future.add_done_callback.call_args[0][0]
+        callback(mock_future)
+        assert dispatcher._pending == set()
 
 
 class TestEventDispatcherShutdown:
@@ -141,7 +170,7 @@ class TestEventDispatcherShutdown:
         """Reset singleton before each test."""
         reset_event_dispatcher()
 
-    @patch('iap_emulator.services.event_dispatcher.pubsub_v1.PublisherClient')
+    @patch('google.cloud.pubsub_v1.PublisherClient')
     def test_shutdown_cleans_up_resources(self, mock_publisher_class):
         """Test that shutdown properly cleans up resources."""
         mock_publisher = Mock()
@@ -156,6 +185,38 @@ class TestEventDispatcherShutdown:
         assert dispatcher._publisher is None
         assert dispatcher._topic_path is None
 
+    @patch('google.cloud.pubsub_v1.PublisherClient')
+    def test_shutdown_stops_and_closes_publisher(self, mock_publisher_class):
+        """Test that shutdown stops the publisher and closes its channel."""
+        mock_publisher = Mock()
+        mock_publisher.topic_path.return_value = "projects/emulator-project/topics/iap_rtdn"
+        mock_publisher_class.return_value = mock_publisher
+
+        dispatcher = EventDispatcher()
+        dispatcher.shutdown()
+
+        mock_publisher.stop.assert_called_once()
+        mock_publisher.transport.close.assert_called_once()
+
+    @patch('google.cloud.pubsub_v1.SubscriberClient')
+    @patch('google.cloud.pubsub_v1.PublisherClient')
+    def test_shutdown_closes_subscriber(self, mock_publisher_class, mock_subscriber_class):
+        """Test that the subscriber client is created once and closed on shutdown."""
+        mock_publisher = Mock()
+        mock_publisher.topic_path.return_value = "projects/emulator-project/topics/iap_rtdn"
+        mock_publisher_class.return_value = mock_publisher
+        mock_subscriber = Mock()
+        mock_subscriber_class.return_value = mock_subscriber
+
+        dispatcher = EventDispatcher()
+        dispatcher._ensure_subscription_exists("emulator-project", "iap_rtdn", "iap_rtdn-sub")
+        mock_subscriber_class.assert_called_once()
+
+        dispatcher.shutdown()
+
+        mock_subscriber.close.assert_called_once()
+        assert dispatcher._subscriber is None
+
 
 class TestNotificationFormat:
     """Test that notifications are formatted correctly."""
@@ -164,7 +225,7 @@ class TestNotificationFormat:
         """Reset singleton before each test."""
         reset_event_dispatcher()
 
-    @patch('iap_emulator.services.event_dispatcher.pubsub_v1.PublisherClient')
+    @patch('google.cloud.pubsub_v1.PublisherClient')
     def test_subscription_notification_format(self, mock_publisher_class):
         """Test that subscription notifications have correct structure."""
         mock_publisher = Mock()
@@ -1 +1,169 @@
 """Unit tests for Pydantic models."""
+
+import pytest
+from pydantic import ValidationError
+
+from iap_emulator.models import (
+    CreatePurchaseResponse,
+    DeveloperNotification,
+    ErrorResponse,
+    ProductPurchase,
+    SubscriptionNotification,
+)
+
+
+class TestResponseBuild:
+    """Test building response models from trusted internal state."""
+
+    def test_build_sets_fields_and_defaults(self):
+        """Test that build() populates given fields and applies defaults."""
+        response = ProductPurchase.build(
+            purchaseTimeMillis=1700000000000,
+            purchaseState=0,
+            consumptionState=0,
+            orderId="GPA.1234-5678-9012-3456",
+            acknowledgementState=0,
+            purchaseToken="emulator_purchase_abc",
+            productId="coins.100",
+        )
+
+        assert isinstance(response, ProductPurchase)
+        assert response.kind == "androidpublisher#productPurchase"
+        assert response.quantity == 1
+        assert response.developerPayload is None
+        assert response.model_fields_set == {
+            "purchaseTimeMillis",
+            "purchaseState",
+            "consumptionState",
+            "orderId",
+            "acknowledgementState",
+            "purchaseToken",
+            "productId",
+        }
+
+    def test_build_serializes_like_validated_model(self):
+        """Test that built responses serialize the same as validated ones."""
+        fields = {
+            "token": "emulator_purchase_abc",
+            "product_id": "coins.100",
+            "user_id": "user-123",
+            "order_id": "GPA.1234-5678-9012-3456",
+            "purchase_time_millis": 1700000000000,
+            "purchase_state": 0,
+            "acknowledgement_state": 0,
+            "consumption_state": 0,
+            "message": "Purchase created successfully",
+        }
+
+        built = CreatePurchaseResponse.build(**fields)
+        validated = CreatePurchaseResponse(**fields)
+
+        assert built.model_dump_json() == validated.model_dump_json()
+
+    def test_build_preserves_field_order(self):
+        """Test that defaulted fields keep their declared position."""
+        response = ProductPurchase.build(
+            purchaseTimeMillis=1700000000000,
+            purchaseState=0,
+            consumptionState=0,
+            orderId="GPA.1234-5678-9012-3456",
+            acknowledgementState=0,
+            purchaseToken="emulator_purchase_abc",
+            productId="coins.100",
+        )
+
+        assert list(response.model_dump()) == list(ProductPurchase.model_fields)
+
+    def test_int64_fields_serialize_as_strings(self):
+        """Test that int64 fields are held as ints and written as JSON strings."""
+        response = ProductPurchase.build(
+            purchaseTimeMillis=1700000000000,
+            purchaseState=0,
+            consumptionState=0,
+            orderId="GPA.1234-5678-9012-3456",
+            acknowledgementState=0,
+            purchaseToken="emulator_purchase_abc",
+            productId="coins.100",
+        )
+
+        assert response.model_dump()["purchaseTimeMillis"] == 1700000000000
+        assert '"purchaseTimeMillis":"1700000000000"' in response.model_dump_json()
+
+    def test_to_json_response(self):
+        """Test that to_json_response() encodes the model as the response body."""
+        response = CreatePurchaseResponse.build(
+            token="emulator_purchase_abc",
+            product_id="coins.100",
+            user_id="user-123",
+            order_id="GPA.1234-5678-9012-3456",
+            purchase_time_millis=1700000000000,
+            purchase_state=0,
+            acknowledgement_state=0,
+            consumption_state=0,
+            message="Purchase created successfully",
+        )
+
+        http_response = response.to_json_response(status_code=201)
+
+        assert http_response.status_code == 201
+        assert http_response.media_type == "application/json"
+        assert http_response.body == response.model_dump_json().encode()
+
+    def test_to_json_response_omits_unset_optional_fields(self):
+        """Test that Google API resources leave out null optional fields."""
+        response = ProductPurchase.build(
+            purchaseTimeMillis=1700000000000,
+            purchaseState=0,
+            consumptionState=0,
+            orderId="GPA.1234-5678-9012-3456",
+            acknowledgementState=0,
+            purchaseToken="emulator_purchase_abc",
+            productId="coins.100",
+        )
+
+        body = response.to_json_response().body
+
+        assert b"developerPayload" not in body
+        assert b'"regionCode":"US"' in body
+
+    def test_response_is_immutable(self):
+        """Test that built responses cannot be modified."""
+        response = ProductPurchase.build(
+            purchaseTimeMillis=1700000000000,
+            purchaseState=0,
+            consumptionState=0,
+            orderId="GPA.1234-5678-9012-3456",
+            acknowledgementState=0,
+            purchaseToken="emulator_purchase_abc",
+            productId="coins.100",
+        )
+
+        with pytest.raises(ValidationError):
+            response.purchaseState = 1
+
+    def test_response_rejects_unknown_fields(self):
+        """Test that validated responses reject fields not in the schema."""
+        with pytest.raises(ValidationError):
+            ErrorResponse(error="Not found", unexpected="value")
+
+
+class TestNotificationModels:
+    """Test RTDN notification models."""
+
+    def test_notifications_share_version(self):
+        """Test that notification payloads default to version 1.0 first."""
+        notification = DeveloperNotification(
+            package_name="com.example.secureapp",
+            event_time_millis=1700000000000,
+            subscription_notification=SubscriptionNotification(
+                notification_type=2,
+                purchase_token="emulator_abc",
+                subscription_id="premium.personal.yearly",
+            ),
+        )
+
+        data = notification.model_dump()
+
+        assert list(data)[0] == "version"
+        assert data["version"] == "1.0"
+        assert data["subscription_notification"]["version"] == "1.0"
@@ -1,7 +1,10 @@
 """Tests for ProductRepository - subscription loading and lookup."""
 
+from unittest.mock import MagicMock
+
 import pytest
 
+from iap_emulator.models import ProductDefinition
 from iap_emulator.repositories.product_repository import (
     ProductNotFoundError,
     ProductRepository,
@@ -33,10 +36,15 @@ class TestProductRepositoryBasics:
     def test_get_all_subscription_ids(self, repo):
         """Test getting all subscription IDs."""
         sub_ids = repo.get_all_subscription_ids()
-        assert isinstance(sub_ids, list)
+        assert isinstance(sub_ids, tuple)
         assert len(sub_ids) > 0
         assert all(isinstance(sid, str) for sid in sub_ids)
 
+    def test_listings_are_reused_between_calls(self, repo):
+        """Test that listings are built once per load, not per call."""
+        assert repo.get_all_subscriptions() is repo.get_all_subscriptions()
+        assert repo.get_all_subscription_ids() is repo.get_all_subscription_ids()
+
     def test_get_subscription_count(self, repo):
         """Test subscription count matches actual subscriptions."""
         count = repo.get_subscription_count()
@@ -62,6 +70,7 @@ class TestProductLookup:
         with pytest.raises(ProductNotFoundError) as exc_info:
             repo.get_by_id("non.existent.product")
         assert "not found" in str(exc_info.value).lower()
+        assert "premium.personal.yearly" in str(exc_info.value)
 
     def test_find_by_id_returns_none_when_not_found(self, repo):
         """Test that find_by_id returns None when product not found."""
@@ -107,6 +116,49 @@ class TestProductFiltering:
         result = repo.get_subscriptions_by_base_plan("non-existent-plan")
         assert result == []
 
+    def test_product_without_base_plan_not_indexed(self):
+        """Test that products with no base plan are not filed under a None base plan."""
+        config = MagicMock()
+        config.products.products = [
+            ProductDefinition(
+                id="coins_100",
+                type="inapp",
+                title="100 Coins",
+                description="Pack of 100 coins",
+                price_micros=990000,
+            )
+        ]
+        config.products.subscriptions = [
+            ProductDefinition(
+                id="premium.monthly",
+                type="subs",
+                title="Premium Monthly",
+                description="Monthly subscription",
+                price_micros=9990000,
+                billing_period="P1M",
+                base_plan_id="premium-monthly",
+            )
+        ]
+        repo = ProductRepository(config=config)
+
+        assert None not in repo._products_by_base_plan
+        assert [p.id for p in repo.get_subscriptions_by_base_plan("premium-monthly")] == [
+            "premium.monthly"
+        ]
+        assert repo.get_by_id("coins_100").base_plan_id is None
+
+    def test_filter_by_type_matches_all_products(self, repo):
+        """Test that type filters cover every product exactly once."""
+        inapp = repo.get_subscriptions_by_type("inapp")
+        subs = repo.get_subscriptions_by_type("subs")
+        assert len(inapp) + len(subs) == len(repo)
+
+    def test_filter_result_is_a_copy(self, repo):
+        """Test that modifying a filter result does not affect the repository."""
+        subs_type = repo.get_subscriptions_by_type("subs")
+        subs_type.clear()
+        assert repo.get_subscriptions_by_type("subs") != []
+
 
 class TestProductDetails:
     """Test product detail fields."""
@@ -140,6 +192,14 @@ class TestProductDetails:
         product = repo.get_by_id("premium.personal.yearly")
         assert isinstance(product.features, list)
 
+    def test_product_definition_is_immutable(self, repo):
+        """Test that loaded product definitions cannot be modified."""
+        from pydantic import ValidationError
+
+        product = repo.get_by_id("premium.personal.yearly")
+        with pytest.raises(ValidationError):
+            product.price_micros = 0
+
 
 class TestSingletonPattern:
     """Test singleton pattern for repository."""
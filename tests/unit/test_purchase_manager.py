@@ -192,6 +192,33 @@ class TestPurchaseCreation:
         stored_purchase = purchase_store.get_by_token(purchase.token)
         assert stored_purchase == purchase
 
+    def test_create_purchases_stores_all(self, purchase_manager, purchase_store):
+        """Test creating several purchases in one call."""
+        purchases = purchase_manager.create_purchases(
+            [
+                {"product_id": "coins_1000", "package_name": "com.example.game", "user_id": "user-1"},
+                {"product_id": "premium_unlock", "package_name": "com.example.game", "user_id": "user-2"},
+            ]
+        )
+
+        assert [p.product_id for p in purchases] == ["coins_1000", "premium_unlock"]
+        assert purchase_store.count() == 2
+        assert purchase_store.get_by_token(purchases[1].token).user_id == "user-2"
+
+    def test_create_purchases_invalid_product_adds_nothing(
+        self, purchase_manager, purchase_store
+    ):
+        """Test that an unknown product in the batch stores no purchases."""
+        with pytest.raises(ProductNotFoundError):
+            purchase_manager.create_purchases(
+                [
+                    {"product_id": "coins_1000", "package_name": "com.example.game", "user_id": "user-1"},
+                    {"product_id": "invalid_product", "package_name": "com.example.game", "user_id": "user-1"},
+                ]
+            )
+
+        assert purchase_store.count() == 0
+
 
 class TestPurchaseRetrieval:
     """Test purchase retrieval."""
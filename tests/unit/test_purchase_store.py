@@ -198,6 +198,44 @@ class TestPurchaseQueryMethods:
 
         assert result is None
 
+    def test_get_by_order_id(self, store, sample_purchase, sample_purchase_2):
+        """Test getting a purchase by order ID."""
+        store.add(sample_purchase)
+        store.add(sample_purchase_2)
+
+        assert store.get_by_order_id("GPA.9876-5432-1098") is sample_purchase_2
+        assert store.find_by_order_id("GPA.1234-5678-9012") is sample_purchase
+
+    def test_get_by_order_id_not_found(self, store, sample_purchase):
+        """Test order ID lookups for unknown and removed purchases."""
+        store.add(sample_purchase)
+        store.remove(sample_purchase.token)
+
+        assert store.find_by_order_id("GPA.1234-5678-9012") is None
+        with pytest.raises(PurchaseNotFoundError):
+            store.get_by_order_id("GPA.1234-5678-9012")
+
+    def test_queries_follow_user_change(self, store, sample_purchase):
+        """Test user lookups reflect a user_id changed through update."""
+        store.add(sample_purchase)
+        sample_purchase.user_id = "user-789"
+        store.update(sample_purchase)
+
+        assert store.get_by_user("user-123") == []
+        assert store.get_by_user("user-789") == [sample_purchase]
+
+    def test_queries_exclude_removed_purchases(self, store, sample_purchase, sample_purchase_2):
+        """Test removed and cleared purchases drop out of lookups."""
+        store.add(sample_purchase)
+        store.add(sample_purchase_2)
+        store.remove(sample_purchase.token)
+
+        assert store.get_by_user("user-123") == []
+        assert store.get_by_package("com.example.game") == [sample_purchase_2]
+
+        store.clear()
+        assert store.get_by_product_id("premium_unlock") == []
+
 
 class TestPurchaseModification:
     """Test purchase update and delete operations."""
@@ -267,6 +305,23 @@ class TestPurchaseModification:
 class TestBulkOperations:
     """Test bulk operations on store."""
 
+    def test_add_many(self, store, sample_purchase, sample_purchase_2):
+        """Test adding several purchases at once."""
+        store.add_many([sample_purchase, sample_purchase_2])
+
+        assert store.count() == 2
+        assert store.get_by_user("user-456") == [sample_purchase_2]
+
+    def test_add_many_duplicate_adds_nothing(self, store, sample_purchase, sample_purchase_2):
+        """Test a duplicate token rejects the whole batch."""
+        store.add(sample_purchase)
+
+        with pytest.raises(ValueError):
+            store.add_many([sample_purchase_2, sample_purchase])
+
+        assert store.count() == 1
+        assert not store.exists(sample_purchase_2.token)
+
     def test_get_all(self, store, sample_purchase, sample_purchase_2):
         """Test getting all purchases."""
         store.add(sample_purchase)
@@ -372,6 +427,18 @@ class TestStatistics:
         assert stats["unique_products"] == 2
         assert stats["unique_packages"] == 2
 
+    def test_statistics_after_remove(self, store, sample_purchase, sample_purchase_2):
+        """Test unique counts drop once a value's last purchase is removed."""
+        store.add(sample_purchase)
+        store.add(sample_purchase_2)
+        store.remove(sample_purchase.token)
+
+        stats = store.get_statistics()
+        assert stats["total_purchases"] == 1
+        assert stats["unique_users"] == 1
+        assert stats["unique_products"] == 1
+        assert stats["unique_packages"] == 1
+
     def test_statistics_empty_store(self, store):
         """Test statistics on empty store."""
         stats = store.get_statistics()
@@ -5,6 +5,7 @@ Tests subscription and purchase state transitions with automatic logging.
 
 import os
 import time
+from unittest.mock import patch
 
 import pytest
 
@@ -450,6 +451,94 @@ class TestStateChangeReasons:
         assert subscription.auto_renewing is False
 
 
+class TestSubscriptionTransactions:
+    """Test batched logging of subscription changes."""
+
+    def test_changes_logged_once_in_order(self, setup_logging, subscription):
+        """Test changes inside a transaction produce a single ordered log entry."""
+        new_expiry = subscription.expiry_time_millis + 1000
+        with patch(
+            "iap_emulator.models.subscription.log_subscription_transition"
+        ) as log_transition, patch(
+            "iap_emulator.models.subscription.log_subscription_state_change"
+        ) as log_state:
+            with subscription.transaction(reason="renewal"):
+                subscription.set_payment_state(PaymentState.PAYMENT_PENDING, reason="retry")
+                subscription.extend_expiry(new_expiry, reason="Renewal #1")
+                subscription.set_state(SubscriptionState.CANCELED, reason="user_requested")
+                subscription.set_auto_renewing(False)
+
+        log_state.assert_not_called()
+        log_transition.assert_called_once()
+        kwargs = log_transition.call_args.kwargs
+        assert kwargs["reason"] == "renewal"
+        assert [change["seq"] for change in kwargs["changes"]] == [0, 1, 2, 3]
+        assert [change["field"] for change in kwargs["changes"]] == [
+            "payment_state",
+            "expiry_time_millis",
+            "state",
+            "auto_renewing",
+        ]
+        assert kwargs["changes"][2] == {
+            "seq": 2,
+            "field": "state",
+            "old": "ACTIVE",
+            "new": "CANCELED",
+            "reason": "user_requested",
+        }
+        assert subscription.state == SubscriptionState.CANCELED
+        assert subscription.expiry_time_millis == new_expiry
+
+    def test_no_changes_not_logged(self, setup_logging, subscription):
+        """Test an empty transaction emits nothing."""
+        with patch(
+            "iap_emulator.models.subscription.log_subscription_transition"
+        ) as log_transition:
+            with subscription.transaction():
+                subscription.set_state(subscription.state)
+
+        log_transition.assert_not_called()
+
+    def test_changes_logged_individually_after_transaction(self, setup_logging, subscription):
+        """Test logging goes back to per-change entries once the block exits."""
+        with subscription.transaction():
+            subscription.set_auto_renewing(False)
+
+        with patch(
+            "iap_emulator.models.subscription.log_subscription_state_change"
+        ) as log_state:
+            subscription.set_state(SubscriptionState.CANCELED)
+
+        log_state.assert_called_once()
+
+    def test_changes_flushed_on_error(self, setup_logging, subscription):
+        """Test buffered changes are still logged if the block raises."""
+        with patch(
+            "iap_emulator.models.subscription.log_subscription_transition"
+        ) as log_transition:
+            with pytest.raises(RuntimeError):
+                with subscription.transaction():
+                    subscription.set_state(SubscriptionState.CANCELED)
+                    raise RuntimeError("boom")
+
+        log_transition.assert_called_once()
+
+    def test_other_record_changes_not_buffered(self, setup_logging, subscription):
+        """Test changes to another record inside a transaction are logged for that record."""
+        other = subscription.model_copy(update={"token": "emulator_sub_other456"})
+        with patch(
+            "iap_emulator.models.subscription.log_subscription_transition"
+        ) as log_transition, patch(
+            "iap_emulator.models.subscription.log_subscription_state_change"
+        ) as log_state:
+            with subscription.transaction():
+                other.set_state(SubscriptionState.CANCELED)
+
+        log_transition.assert_not_called()
+        log_state.assert_called_once()
+        assert log_state.call_args.kwargs["token"] == "emulator_sub_other456"
+
+
 # Parametrized tests for subscription states
 @pytest.mark.parametrize(
     "target_state,reason",
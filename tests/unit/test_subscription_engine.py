@@ -1,5 +1,6 @@
 """Unit tests for SubscriptionEngine service."""
 
+import threading
 import time
 from unittest.mock import MagicMock, patch
 
@@ -8,6 +9,7 @@ import pytest
 from iap_emulator.models.product import ProductDefinition
 from iap_emulator.models.subscription import (
     CancelReason,
+    NotificationType,
     PaymentState,
     SubscriptionState,
 )
@@ -950,6 +952,60 @@ class TestGracePeriodToAccountHold:
         sub2_updated = engine.get_subscription(sub2.token)
         assert sub2_updated.state == SubscriptionState.IN_GRACE_PERIOD
 
+    def test_process_grace_period_expirations_publishes_on_hold(self, engine):
+        """Test that each subscription moved to hold gets an ON_HOLD event."""
+        engine.store.clear()
+        dispatcher = MagicMock()
+        engine._event_dispatcher = dispatcher
+
+        for i in range(2):
+            sub = engine.create_subscription(
+                subscription_id="premium.monthly",
+                user_id=f"user-grace-event-{i}",
+            )
+            engine.simulate_payment_failure(sub.token)
+        dispatcher.reset_mock()
+
+        future_time = int(time.time() * 1000) + (4 * 86400000)
+        transitioned = engine.process_grace_period_expirations(future_time)
+
+        published = [
+            call.kwargs["purchase_token"]
+            for call in dispatcher.publish_subscription_event.call_args_list
+            if call.kwargs["notification_type"] == NotificationType.SUBSCRIPTION_ON_HOLD
+        ]
+        assert published == [sub.token for sub in transitioned]
+        assert all(sub.account_hold_start_millis == future_time for sub in transitioned)
+
+    def test_process_grace_period_expirations_skips_removed(self, engine):
+        """Test that a subscription removed during the sweep is not reported or published."""
+        engine.store.clear()
+        dispatcher = MagicMock()
+        engine._event_dispatcher = dispatcher
+
+        subs = []
+        for i in range(2):
+            sub = engine.create_subscription(
+                subscription_id="premium.monthly",
+                user_id=f"user-grace-removed-{i}",
+            )
+            subs.append(engine.simulate_payment_failure(sub.token))
+        in_grace = engine.store.get_in_grace_period()
+        engine.store.remove(subs[0].token)
+        dispatcher.reset_mock()
+
+        future_time = int(time.time() * 1000) + (4 * 86400000)
+        with patch.object(engine.store, "get_in_grace_period", return_value=in_grace):
+            transitioned = engine.process_grace_period_expirations(future_time)
+
+        assert [sub.token for sub in transitioned] == [subs[1].token]
+        published = [
+            call.kwargs["purchase_token"]
+            for call in dispatcher.publish_subscription_event.call_args_list
+        ]
+        assert published == [subs[1].token]
+        assert engine.get_subscription(subs[1].token).state == SubscriptionState.ON_HOLD
+
 
 class TestPaymentRecovery:
     """Tests for payment recovery from grace period and account hold."""
@@ -1118,3 +1174,80 @@ class TestPaymentFailureLifecycle:
         renewed = engine.renew_subscription(subscription.token)
         assert renewed.state == SubscriptionState.ACTIVE
         assert renewed.renewal_count == 1
+
+
+class TestConcurrentTransitions:
+    """Tests for per-subscription locking of state transitions."""
+
+    def test_lock_is_shared_per_token(self, engine):
+        """Test that one token maps to one lock and different tokens to different locks."""
+        lock = engine._lock_for("token-a")
+
+        assert engine._lock_for("token-a") is lock
+        assert engine._lock_for("token-b") is not lock
+
+    def test_concurrent_cancels_succeed_once(self, engine):
+        """Test that only one of several concurrent cancellations succeeds."""
+        subscription = engine.create_subscription(
+            subscription_id="premium.monthly",
+            user_id="user-concurrent",
+        )
+        barrier = threading.Barrier(8)
+        results = []
+
+        def cancel():
+            barrier.wait()
+            try:
+                engine.cancel_subscription(subscription.token, immediate=True)
+                results.append("ok")
+            except InvalidSubscriptionStateError:
+                results.append("rejected")
+
+        threads = [threading.Thread(target=cancel) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results.count("ok") == 1
+        assert results.count("rejected") == 7
+
+    def test_engines_sharing_a_store_share_locks(
+        self, engine, subscription_store, product_repo, mock_config
+    ):
+        """Test that transitions through two engines on one store are serialized."""
+        with patch(
+            "iap_emulator.services.subscription_engine.get_config", return_value=mock_config
+        ):
+            other = SubscriptionEngine(
+                subscription_store=subscription_store,
+                product_repository=product_repo,
+            )
+        subscription = engine.create_subscription(
+            subscription_id="premium.monthly",
+            user_id="user-two-engines",
+        )
+        assert other._lock_for(subscription.token) is engine._lock_for(subscription.token)
+
+        barrier = threading.Barrier(8)
+        results = []
+
+        def cancel(target):
+            barrier.wait()
+            try:
+                target.cancel_subscription(subscription.token, immediate=True)
+                results.append("ok")
+            except InvalidSubscriptionStateError:
+                results.append("rejected")
+
+        threads = [
+            threading.Thread(target=cancel, args=(engine if i % 2 else other,))
+            for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results.count("ok") == 1
+        assert results.count("rejected") == 7
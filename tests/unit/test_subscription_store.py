@@ -160,6 +160,19 @@ class TestSubscriptionQueryMethods:
         result = store.get_by_user("non_existent_user")
         assert result == []
 
+    def test_get_by_user_with_package(self, store, sample_subscription, sample_subscription_2):
+        """Test filtering a user's subscriptions by package_name."""
+        sample_subscription_2.user_id = sample_subscription.user_id
+        sample_subscription_2.package_name = "com.example.other"
+        store.add(sample_subscription)
+        store.add(sample_subscription_2)
+
+        assert store.get_by_user("user-123", package_name="com.example.other") == [
+            sample_subscription_2
+        ]
+        assert store.get_by_user("user-123", package_name="com.example.missing") == []
+        assert len(store.get_by_user("user-123")) == 2
+
     def test_get_by_package(self, store, sample_subscription, sample_subscription_2):
         """Test getting subscriptions by package_name."""
         store.add(sample_subscription)
@@ -203,6 +216,46 @@ class TestSubscriptionQueryMethods:
 
         assert result is None
 
+    def test_get_by_order_id(self, store, sample_subscription, sample_subscription_2):
+        """Test getting a subscription by order ID."""
+        store.add(sample_subscription)
+        store.add(sample_subscription_2)
+
+        assert store.get_by_order_id("GPA.9876-5432-1098") is sample_subscription_2
+        assert store.find_by_order_id("GPA.1234-5678-9012") is sample_subscription
+
+    def test_get_by_order_id_not_found(self, store, sample_subscription):
+        """Test order ID lookups for unknown and removed subscriptions."""
+        store.add(sample_subscription)
+        store.remove(sample_subscription.token)
+
+        assert store.find_by_order_id("GPA.1234-5678-9012") is None
+        with pytest.raises(SubscriptionNotFoundError):
+            store.get_by_order_id("GPA.1234-5678-9012")
+
+    def test_queries_follow_user_change(self, store, sample_subscription):
+        """Test user lookups reflect a user_id changed through update."""
+        store.add(sample_subscription)
+        sample_subscription.user_id = "user-789"
+        store.update(sample_subscription)
+
+        assert store.get_by_user("user-123") == []
+        assert store.get_by_user("user-789") == [sample_subscription]
+
+    def test_queries_exclude_removed_subscriptions(
+        self, store, sample_subscription, sample_subscription_2
+    ):
+        """Test removed and cleared subscriptions drop out of lookups."""
+        store.add(sample_subscription)
+        store.add(sample_subscription_2)
+        store.remove(sample_subscription.token)
+
+        assert store.get_by_user("user-123") == []
+        assert store.get_by_package("com.example.app") == [sample_subscription_2]
+
+        store.clear()
+        assert store.get_by_subscription_id("premium.family.monthly") == []
+
 
 class TestStateBasedQueries:
     """Test state-based query methods."""
@@ -382,6 +435,38 @@ class TestTimeBasedQueries:
         assert renewals[0].token == "renewal_1"
         assert renewals[0].auto_renewing is True
 
+    def test_get_expiring_soon_ordered_by_expiry(
+        self, store, sample_subscription, sample_subscription_2
+    ):
+        """Test expiring subscriptions are returned soonest first."""
+        store.add(sample_subscription)
+        store.add(sample_subscription_2)
+
+        expiring = store.get_expiring_soon(sample_subscription.expiry_time_millis)
+        assert [s.token for s in expiring] == [
+            sample_subscription_2.token,
+            sample_subscription.token,
+        ]
+
+    def test_get_expiring_soon_follows_updated_expiry(self, store, sample_subscription):
+        """Test expiry queries reflect an expiry changed through update."""
+        store.add(sample_subscription)
+        old_expiry = sample_subscription.expiry_time_millis
+
+        sample_subscription.extend_expiry(old_expiry + 1000, reason="test")
+        assert store.get_expiring_soon(old_expiry) == []
+
+        store.update(sample_subscription)
+        assert store.get_expiring_soon(old_expiry) == []
+        assert store.get_expiring_soon(old_expiry + 1000) == [sample_subscription]
+
+    def test_get_expiring_soon_excludes_removed(self, store, sample_subscription):
+        """Test removed subscriptions drop out of expiry queries."""
+        store.add(sample_subscription)
+        store.delete_by_token(sample_subscription.token)
+
+        assert store.get_expiring_soon(sample_subscription.expiry_time_millis) == []
+
 
 class TestTrialQueries:
     """Test trial period queries."""
@@ -494,6 +579,45 @@ class TestSubscriptionModification:
 class TestBulkOperations:
     """Test bulk operations on store."""
 
+    def test_add_many(self, store, sample_subscription, sample_subscription_2):
+        """Test adding several subscriptions at once."""
+        store.add_many([sample_subscription, sample_subscription_2])
+
+        assert store.count() == 2
+        assert store.get_by_user("user-456") == [sample_subscription_2]
+
+    def test_add_many_duplicate_adds_nothing(self, store, sample_subscription, sample_subscription_2):
+        """Test a duplicate token rejects the whole batch."""
+        store.add(sample_subscription)
+
+        with pytest.raises(ValueError):
+            store.add_many([sample_subscription_2, sample_subscription])
+
+        assert store.count() == 1
+        assert not store.exists(sample_subscription_2.token)
+
+    def test_update_many(self, store, sample_subscription, sample_subscription_2):
+        """Test updating several subscriptions at once."""
+        store.add_many([sample_subscription, sample_subscription_2])
+        sample_subscription.user_id = "user-moved"
+        sample_subscription_2.user_id = "user-moved"
+
+        store.update_many([sample_subscription, sample_subscription_2])
+
+        assert store.count_by_user("user-moved") == 2
+
+    def test_update_many_unknown_token_updates_nothing(
+        self, store, sample_subscription, sample_subscription_2
+    ):
+        """Test an unknown token rejects the whole batch."""
+        store.add(sample_subscription)
+        sample_subscription.user_id = "user-moved"
+
+        with pytest.raises(SubscriptionNotFoundError):
+            store.update_many([sample_subscription, sample_subscription_2])
+
+        assert store.count_by_user("user-moved") == 0
+
     def test_get_all(self, store, sample_subscription, sample_subscription_2):
         """Test getting all subscriptions."""
         store.add(sample_subscription)